@@ -4,6 +4,9 @@ from .exLoadoutA import exLoadoutSeg
 from .exLoadoutG import exLoadoutSeg2
 from .exLoadoutReadColumn import exLoadoutReadColumn
 from .exLoadoutEditCell import exLoadoutEditCell
+from .exLoadoutValidate import exLoadoutValidate
+from .exLoadoutLoraStack import exLoadoutLoraStack
+from .exLoadoutRoutes import register_server_routes
 
 NODE_CLASS_MAPPINGS = {
     "exCheckpointLoader": exLoadoutCheckpointLoader,
@@ -12,6 +15,8 @@ NODE_CLASS_MAPPINGS = {
     "exSeg2": exLoadoutSeg2,
     "exLoadoutReadColumn": exLoadoutReadColumn,
     "exLoadoutEditCell": exLoadoutEditCell,
+    "exLoadoutValidate": exLoadoutValidate,
+    "exLoadoutLoraStack": exLoadoutLoraStack,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -21,6 +26,10 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "exSeg2": "exLoadoutG",
     "exLoadoutReadColumn": "exLoadoutReadColumn",
     "exLoadoutEditCell": "exLoadoutEditCell",
+    "exLoadoutValidate": "exLoadoutValidate",
+    "exLoadoutLoraStack": "exLoadoutLoraStack",
 }
 
+register_server_routes()
+
 print("ExcelPicker Node Loaded Successfully")
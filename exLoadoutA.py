@@ -1,6 +1,6 @@
-import openpyxl
 import os
 from typing import Union
+from .exLoadoutSnapshot import load_snapshot
 
 def get_full_path_or_raise(base_folder, file_path):
     """
@@ -51,6 +51,35 @@ class AnyType(str):
 
 ANY = AnyType("*")
 
+def parse_column_selection(columns, first_column):
+    """
+    Parses a column selection such as "B, D, Outputs" for a node reading six columns from first_column.
+
+    Args:
+        columns: Comma separated column letters and/or "Outputs"; empty selects everything
+        first_column: 1-based index of the node's first column (1 for A, 7 for G)
+
+    Returns:
+        tuple: (set of selected column offsets 0-5, whether the Outputs summary is selected)
+    """
+    if not columns.strip():
+        return set(range(6)), True
+    letters = [chr(ord("A") + first_column - 1 + offset) for offset in range(6)]
+    offsets, summary = set(), False
+    for part in columns.split(","):
+        part = part.strip().upper()
+        if not part:
+            continue
+        if part == "OUTPUTS":
+            summary = True
+        elif part in letters:
+            offsets.add(letters.index(part))
+        else:
+            raise ValueError(f"Invalid column '{part}'. Use {', '.join(letters)} or Outputs.")
+    if summary:
+        offsets = set(range(6))  # The summary lists every column
+    return offsets, summary
+
 class exLoadoutSeg:
     @classmethod
     def INPUT_TYPES(cls):
@@ -60,7 +89,10 @@ class exLoadoutSeg:
                 "sheet_name": ("STRING", {"default": "KSAMPLER"}),
                 "row_number": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1}),
                 "search_string": ("STRING", {"default": ""}),
-            }
+            },
+            "optional": {
+                "columns": ("STRING", {"default": ""}),
+            },
         }
     
     RETURN_TYPES = (ANY, ANY, ANY, ANY, ANY, ANY, "STRING")
@@ -69,10 +101,11 @@ class exLoadoutSeg:
     FUNCTION = "process_excel"
     CATEGORY = "exLoadout"
     DESCRIPTION = ("Reads values from columns A through F for a specified row number in an Excel spreadsheet. "
-                   "Can also search for a string in Column A.")
+                   "Can also search for a string in Column A. "
+                   "columns (e.g. 'B, D' or 'Outputs') limits which outputs are read and formatted; the rest are left empty.")
     NAME = "exLoadoutSeg (List)"
     
-    def process_excel(self, excel_path, sheet_name, row_number, search_string):
+    def process_excel(self, excel_path, sheet_name, row_number, search_string, columns=""):
         # Secure path resolution - look in current directory (ComfyUI-exLoadout folder)
         full_excel_path = get_full_path_or_raise(".", excel_path)
         
@@ -88,10 +121,9 @@ class exLoadoutSeg:
                                   f"Expected location: {full_excel_path}\n"
                                   f"Make sure the file exists in: {base_dir}")
         
-        workbook = openpyxl.load_workbook(full_excel_path)
+        workbook = load_snapshot(full_excel_path)
         
-        if sheet_name not in workbook.sheetnames:
-            workbook.close()
+        if sheet_name not in workbook:
             raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file.")
         
         sheet = workbook[sheet_name]
@@ -99,27 +131,24 @@ class exLoadoutSeg:
         # If search_string is provided, look for it in Column A
         actual_row = row_number
         if search_string:
-            found = False
-            for row_idx in range(1, sheet.max_row + 1):
-                cell_value = sheet.cell(row=row_idx, column=1).value
-                if cell_value is not None and str(cell_value).strip() == search_string:
-                    actual_row = row_idx
-                    found = True
-                    break
-            
-            if not found:
-                workbook.close()
+            actual_row = sheet.find_row(search_string)
+            if actual_row is None:
                 raise ValueError(f"Search string '{search_string}' not found in Column A.")
         
         if actual_row < 1 or actual_row > sheet.max_row:
-            workbook.close()
             raise ValueError(f"Row number {actual_row} is out of range. Sheet has {sheet.max_row} rows.")
         
-        row_data = [sheet.cell(row=actual_row, column=col).value for col in range(1, 7)]  # A-F
-        row_data = ['' if value is None else value for value in row_data]
-        workbook.close()
+        # Only the selected columns are read; the others are left empty
+        selected, summary = parse_column_selection(columns, 1)
+        found_row = sheet.row(actual_row)
+        row_data = []
+        for offset in range(6):  # A-F
+            value = found_row[1 + offset] if offset in selected else None
+            row_data.append('' if value is None else value)
         
-        outputs_summary = f"%A: {row_data[0]} %B: {row_data[1]} %C: {row_data[2]} %D: {row_data[3]} %E: {row_data[4]} %F: {row_data[5]} %"
+        outputs_summary = ''
+        if summary:
+            outputs_summary = f"%A: {row_data[0]} %B: {row_data[1]} %C: {row_data[2]} %D: {row_data[3]} %E: {row_data[4]} %F: {row_data[5]} %"
         
         return ([row_data[0]], [row_data[1]], [row_data[2]], [row_data[3]], [row_data[4]], [row_data[5]], outputs_summary)
 
@@ -1,7 +1,13 @@
-import openpyxl
 import os
-from folder_paths import get_filename_list, get_full_path_or_raise, get_folder_paths
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from folder_paths import get_full_path_or_raise, get_folder_paths
 import comfy.sd
+from .exLoadoutSnapshot import load_snapshot
+from .exLoadoutModelIndex import get_filename_set
+from .exLoadoutModelInfo import get_model_info
 
 def get_excel_full_path_or_raise(base_folder, file_path):
     """
@@ -45,6 +51,160 @@ def get_excel_full_path_or_raise(base_folder, file_path):
     
     return resolved_path
 
+class ResidentComponents:
+    """
+    Loaded checkpoints, CLIPs and VAEs kept in memory between runs, keyed by file identity.
+
+    Keys are (component, path, mtime_ns, size, *extra), so loadouts that reference
+    the same file share one object and an edited file is loaded again. Up to
+    limit objects per component are kept, least recently used first out.
+
+    Resident objects are held outside ComfyUI's own model cache, so reuse is
+    opt-in: the default limit of 0 keeps nothing.
+    """
+
+    def __init__(self, limit=0):
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.loading = {}
+
+    def get(self, component, path, loader, *extra, accept=None):
+        """
+        Returns the resident object for path, calling loader() if there is none.
+
+        accept(value) can reject a resident object (e.g. a checkpoint loaded without
+        its CLIP), in which case it is loaded again and replaced.
+        """
+        stat = os.stat(path)
+        key = (component, path, stat.st_mtime_ns, stat.st_size) + extra
+        with self.lock:
+            if key in self.entries and (accept is None or accept(self.entries[key])):
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            key_lock = self.loading.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same file wait for one load instead of starting their own
+        with key_lock:
+            with self.lock:
+                if key in self.entries and (accept is None or accept(self.entries[key])):
+                    return self.entries[key]
+                # Release what is about to be replaced before the new weights are read
+                for stale_key in [k for k in self.entries if k[:2] == key[:2]]:
+                    del self.entries[stale_key]
+                self.evict(component, self.limit - 1)
+            try:
+                value = loader()
+            except Exception:
+                with self.lock:
+                    self.loading.pop(key, None)
+                raise
+
+            with self.lock:
+                if self.limit > 0:
+                    self.entries[key] = value
+                    self.evict(component, self.limit)
+                # Only drop the per-key lock once the entry is visible to other callers
+                self.loading.pop(key, None)
+        return value
+
+    def evict(self, component, keep):
+        keys = [k for k in self.entries if k[0] == component]
+        for key in keys[:max(len(keys) - max(keep, 0), 0)]:
+            del self.entries[key]
+
+    def resize(self, limit):
+        with self.lock:
+            if limit == self.limit:
+                return
+            self.limit = limit
+            for component in {k[0] for k in self.entries}:
+                self.evict(component, limit)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+_resident = ResidentComponents()
+
+def load_checkpoint(ckpt_path, output_clip=True, output_vae=True):
+    """
+    Loads (model, clip, vae) from a checkpoint, skipping the CLIP or VAE when an override replaces it.
+
+    A resident checkpoint is reused as long as it holds every part asked for.
+    """
+    def accept(parts):
+        return (parts[1] is not None or not output_clip) and (parts[2] is not None or not output_vae)
+
+    return _resident.get("checkpoint", ckpt_path, lambda: tuple(comfy.sd.load_checkpoint_guess_config(
+        ckpt_path,
+        output_vae=output_vae,
+        output_clip=output_clip,
+        embedding_directory=get_folder_paths("embeddings")
+    )[:3]), accept=accept)
+
+def load_clip(clip_path, clip_type):
+    return _resident.get("clip", clip_path, lambda: comfy.sd.load_clip(
+        ckpt_paths=[clip_path],
+        embedding_directory=get_folder_paths("embeddings"),
+        clip_type=clip_type
+    ), clip_type)
+
+def load_vae(vae_path):
+    return _resident.get("vae", vae_path, lambda: comfy.sd.load_vae(vae_path))
+
+def _timed(func, *args):
+    """Runs func and returns (result, seconds). Override failures are returned, not raised."""
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        if func is load_checkpoint:
+            raise
+        result = e
+    return result, time.perf_counter() - start
+
+def _component_jobs(ckpt_path, clip_path, vae_path, clip_type):
+    # The checkpoint's own CLIP/VAE are only read when no override replaces them
+    jobs = {"checkpoint": (load_checkpoint, ckpt_path, not clip_path, not vae_path)}
+    if clip_path:
+        jobs["clip"] = (load_clip, clip_path, clip_type)
+    if vae_path:
+        jobs["vae"] = (load_vae, vae_path)
+    return jobs
+
+def load_components_sequentially(ckpt_path, clip_path, vae_path, clip_type):
+    """
+    Loads the checkpoint, then the CLIP and VAE overrides, one after another.
+
+    Returns:
+        tuple: ({component: result or Exception}, {component: seconds})
+    """
+    loaded, timings = {}, {}
+    for component, (func, *args) in _component_jobs(ckpt_path, clip_path, vae_path, clip_type).items():
+        loaded[component], timings[component] = _timed(func, *args)
+    return loaded, timings
+
+def load_components_concurrently(ckpt_path, clip_path, vae_path, clip_type):
+    """
+    Loads the checkpoint and the CLIP and VAE overrides in parallel threads.
+
+    Deserialization releases the GIL during file reads, so the three files
+    keep the disk busy instead of waiting on each other.
+
+    Returns:
+        tuple: ({component: result or Exception}, {component: seconds, "total": seconds})
+    """
+    start = time.perf_counter()
+    jobs = _component_jobs(ckpt_path, clip_path, vae_path, clip_type)
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="exLoadout") as pool:
+        futures = {component: pool.submit(_timed, func, *args) for component, (func, *args) in jobs.items()}
+        loaded, timings = {}, {}
+        for component, future in futures.items():
+            loaded[component], timings[component] = future.result()
+    timings["total"] = time.perf_counter() - start
+    return loaded, timings
+
 class exLoadoutCheckpointLoader:
     @classmethod
     def INPUT_TYPES(cls):
@@ -55,6 +215,10 @@ class exLoadoutCheckpointLoader:
                 "loadout_name": ("STRING", {"default": ""}),
                 "clip_type": (["stable_diffusion", "stable_cascade", "sd3", "stable_audio", "mochi", "ltxv", "pixart", "cosmos", "lumina2", "wan"],),
             },
+            "optional": {
+                "load_mode": (["sequential", "concurrent"], {"default": "sequential"}),
+                "resident_limit": ("INT", {"default": 0, "min": 0, "max": 16}),
+            },
         }
 
     RETURN_TYPES = ("MODEL", "CLIP", "VAE", "STRING")
@@ -64,10 +228,13 @@ class exLoadoutCheckpointLoader:
     DESCRIPTION = (
         "Loads a checkpoint model by reading its name from Column B, "
         "CLIP from Column C, and VAE from Column D in an Excel file. "
-        "Each row is identified by a 'Loadout' name from Column A."
+        "Each row is identified by a 'Loadout' name from Column A. "
+        "In concurrent mode the three files are read in parallel and load times are added to Output. "
+        "With resident_limit above 0, up to that many checkpoints, CLIPs and VAEs stay loaded, so switching loadouts only loads the parts that differ. "
+        "The limit is shared by every loader node; the last value run applies, and 0 releases them all."
     )
 
-    def exLoadoutCheckpointLoader(self, excel_path, sheet_name, loadout_name, clip_type):
+    def exLoadoutCheckpointLoader(self, excel_path, sheet_name, loadout_name, clip_type, load_mode="sequential", resident_limit=0):
         # Secure path resolution for Excel file - look in current directory
         full_excel_path = get_excel_full_path_or_raise(".", excel_path)
 
@@ -82,73 +249,89 @@ class exLoadoutCheckpointLoader:
                                   f"Expected location: {full_excel_path}\n"
                                   f"Make sure the file exists in: {base_dir}")
 
-        workbook = openpyxl.load_workbook(full_excel_path)
-        if sheet_name not in workbook.sheetnames:
-            workbook.close()
+        workbook = load_snapshot(full_excel_path)
+        if sheet_name not in workbook:
             raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
 
         sheet = workbook[sheet_name]
-        found_row = None
-
-        for row in sheet.iter_rows(min_row=1, max_row=sheet.max_row):
-            if row[0].value and str(row[0].value).strip() == loadout_name:
-                found_row = row
-                break
+        row_number = sheet.find_row(loadout_name)
 
-        workbook.close()
-
-        if not found_row:
+        if row_number is None:
             raise ValueError(f"Loadout '{loadout_name}' not found in Column A.")
 
+        # Row views are 1-based: [2] is Column B, [3] Column C, [4] Column D
+        found_row = sheet.row(row_number)
+
         # Load checkpoint model (Column B)
-        if not found_row[1].value:
+        if not found_row[2]:
             raise ValueError(f"No valid checkpoint name found for Loadout '{loadout_name}' in Column B.")
-        ckpt_name = str(found_row[1].value).strip()
+        ckpt_name = str(found_row[2]).strip()
 
-        allowed_ckpts = get_filename_list("checkpoints")
-        if ckpt_name not in allowed_ckpts:
+        if ckpt_name not in get_filename_set("checkpoints"):
             raise ValueError(f"Checkpoint '{ckpt_name}' is not in the allowed checkpoints list.")
 
         # Use ComfyUI's secure path resolution for model files
         ckpt_path = get_full_path_or_raise("checkpoints", ckpt_name)
-        model, clip, vae = comfy.sd.load_checkpoint_guess_config(
-            ckpt_path,
-            output_vae=True,
-            output_clip=True,
-            embedding_directory=get_folder_paths("embeddings")
-        )[:3]
-
-        # Load CLIP (Column C)
-        clip_name = "Default"
-        if len(found_row) > 2 and found_row[2].value:
-            temp_clip_name = str(found_row[2].value).strip()
-            if temp_clip_name in get_filename_list("text_encoders"):
+
+        # The safetensors header is a few KB; a hint before reading gigabytes of weights
+        ckpt_info = get_model_info(ckpt_path)
+        if ckpt_info is not None and not ckpt_info.is_checkpoint:
+            print(f"Warning: '{ckpt_name}' in Column B looks like a standalone {ckpt_info.family} file, not a checkpoint.")
+
+        # Resolve CLIP (Column C)
+        clip_name, clip_path = None, None
+        if found_row[3]:
+            temp_clip_name = str(found_row[3]).strip()
+            if temp_clip_name in get_filename_set("text_encoders"):
                 try:
                     # Use ComfyUI's secure path resolution for CLIP files
                     clip_path = get_full_path_or_raise("text_encoders", temp_clip_name)
-                    clip = comfy.sd.load_clip(
-                        ckpt_paths=[clip_path],
-                        embedding_directory=get_folder_paths("embeddings"),
-                        clip_type=clip_type
-                    )
                     clip_name = temp_clip_name
                 except Exception as e:
                     print(f"Warning: Failed to load CLIP override '{temp_clip_name}': {e}")
 
-        # Load VAE (Column D)
-        vae_name = "Default"
-        if len(found_row) > 3 and found_row[3].value:
-            temp_vae_name = str(found_row[3].value).strip()
-            if temp_vae_name in get_filename_list("vae"):
+        # Resolve VAE (Column D)
+        vae_name, vae_path = None, None
+        if found_row[4]:
+            temp_vae_name = str(found_row[4]).strip()
+            if temp_vae_name in get_filename_set("vae"):
                 try:
                     # Use ComfyUI's secure path resolution for VAE files
                     vae_path = get_full_path_or_raise("vae", temp_vae_name)
-                    vae = comfy.sd.load_vae(vae_path)
                     vae_name = temp_vae_name
                 except Exception as e:
                     print(f"Warning: Failed to load VAE override '{temp_vae_name}': {e}")
 
-        debug_output = f"Loadout: {loadout_name}, Model: {ckpt_name}, CLIP: {clip_name}, VAE: {vae_name}"
+        if clip_path and ckpt_info is not None and ckpt_info.clip_type not in (None, clip_type):
+            print(f"Warning: '{ckpt_name}' looks like a {ckpt_info.family} model; clip_type '{clip_type}' may not match (expected '{ckpt_info.clip_type}').")
+
+        _resident.resize(resident_limit)
+        if load_mode == "concurrent":
+            loaded, timings = load_components_concurrently(ckpt_path, clip_path, vae_path, clip_type)
+        else:
+            loaded, timings = load_components_sequentially(ckpt_path, clip_path, vae_path, clip_type)
+
+        model, clip, vae = loaded["checkpoint"]
+        if clip_path:
+            if isinstance(loaded["clip"], Exception):
+                print(f"Warning: Failed to load CLIP override '{clip_name}': {loaded['clip']}")
+                clip_name = None
+                # The checkpoint was read without its own CLIP; load it for the fallback
+                model, clip, _ = load_checkpoint(ckpt_path, True, vae_path is None)
+            else:
+                clip = loaded["clip"]
+        if vae_path:
+            if isinstance(loaded["vae"], Exception):
+                print(f"Warning: Failed to load VAE override '{vae_name}': {loaded['vae']}")
+                vae_name = None
+                model, _, vae = load_checkpoint(ckpt_path, clip_name is None, True)
+            else:
+                vae = loaded["vae"]
+
+        debug_output = f"Loadout: {loadout_name}, Model: {ckpt_name}, CLIP: {clip_name or 'Default'}, VAE: {vae_name or 'Default'}"
+        if load_mode == "concurrent":
+            timing_parts = [f"{component} {seconds:.2f}s" for component, seconds in timings.items()]
+            debug_output += f", Load times: {', '.join(timing_parts)}"
         return (model, clip, vae, debug_output)
 
 NODE_CLASS_MAPPINGS = {"exLoadoutCheckpointLoader": exLoadoutCheckpointLoader}
@@ -1,7 +1,10 @@
 import openpyxl
 import os
 import tkinter as tk
+import threading
 from tkinter import ttk
+from openpyxl.utils.exceptions import IllegalCharacterError
+from .exLoadoutSnapshot import invalidate_snapshot
 
 def get_excel_full_path_or_raise(base_folder, file_path):
     """
@@ -45,6 +48,120 @@ def get_excel_full_path_or_raise(base_folder, file_path):
     
     return resolved_path
 
+# Serializes writers so concurrent edits (prompts and HTTP requests) never interleave saves
+_edit_lock = threading.Lock()
+
+def format_row(row_number, values):
+    """Returns a row's values from columns A to L as 'A1: value, B1: value, ...'."""
+    row_values = []
+    for col_idx, cell_value in enumerate(values[:12], start=1):
+        col_letter = openpyxl.utils.get_column_letter(col_idx)
+        row_values.append(f"{col_letter}{row_number}: {str(cell_value)}")
+    return ", ".join(row_values)
+
+def check_edit(max_row, row_number, column_letter):
+    """
+    Validates the target of a single edit.
+
+    Returns:
+        int: The 1-based column index
+
+    Raises:
+        ValueError: If the row or column is out of range
+    """
+    column_index = openpyxl.utils.column_index_from_string(column_letter)
+
+    if row_number < 1 or row_number > max_row:
+        raise ValueError(f"Row {row_number} is out of range. The sheet has {max_row} rows.")
+
+    if column_index < 1 or column_index > 12:
+        raise ValueError(f"Column '{column_letter}' is out of the allowed range A-L.")
+
+    return column_index
+
+def check_value(value):
+    """
+    Validates a new cell value before it is saved or journaled.
+
+    Raises:
+        ValueError: If the value is not a string, number, boolean or None, or openpyxl rejects it
+    """
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise ValueError(f"Unsupported cell value {value!r}. Use a string, number, boolean or empty value.")
+    try:
+        openpyxl.cell.Cell(None, value=value)
+    except (ValueError, IllegalCharacterError):
+        raise ValueError(f"Cell value {value!r} cannot be written to Excel.")
+
+def write_workbook_edits(full_excel_path, edits_by_sheet):
+    """
+    Writes cell edits for one or more sheets of a workbook with a single save.
+
+    Every edit is validated before any cell is changed, so a bad edit leaves the file untouched.
+    Edits are applied in order, so a later edit of the same cell wins.
+
+    Args:
+        full_excel_path: Absolute path of an already validated .xlsx file
+        edits_by_sheet: Mapping of sheet name to a list of (row_number, column_letter, new_value) tuples
+
+    Returns:
+        dict: Sheet name -> {row number -> updated row string (see format_row)} for every edited row
+
+    Raises:
+        ValueError: If a sheet, a row, a column or a value is invalid
+    """
+    with _edit_lock:
+        workbook = openpyxl.load_workbook(full_excel_path)
+        try:
+            resolved = {}
+            for sheet_name, edits in edits_by_sheet.items():
+                if sheet_name not in workbook.sheetnames:
+                    raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+                sheet = workbook[sheet_name]
+                resolved[sheet_name] = [(row_number, check_edit(sheet.max_row, row_number, column_letter), new_value)
+                                        for row_number, column_letter, new_value in edits]
+                for _, _, new_value in resolved[sheet_name]:
+                    check_value(new_value)
+
+            # Edit the cells
+            for sheet_name, sheet_edits in resolved.items():
+                sheet = workbook[sheet_name]
+                for row_number, column_index, new_value in sheet_edits:
+                    sheet.cell(row=row_number, column=column_index).value = new_value
+            workbook.save(full_excel_path)
+            invalidate_snapshot(full_excel_path)
+
+            # Retrieve updated row values from A–L
+            rows = {}
+            for sheet_name, sheet_edits in resolved.items():
+                sheet = workbook[sheet_name]
+                rows[sheet_name] = {
+                    row_number: format_row(row_number, [sheet.cell(row=row_number, column=col_idx).value for col_idx in range(1, 13)])
+                    for row_number, _, _ in sheet_edits
+                }
+            return rows
+        finally:
+            workbook.close()
+
+def write_cell_edits(full_excel_path, sheet_name, edits):
+    """
+    Writes a batch of cell edits to one sheet with a single save (see write_workbook_edits).
+
+    Returns:
+        dict: Row number -> updated row string (see format_row) for every edited row
+    """
+    return write_workbook_edits(full_excel_path, {sheet_name: list(edits)})[sheet_name]
+
+def apply_cell_edits(full_excel_path, sheet_name, edits):
+    """
+    Saves a batch of cell edits straight into the workbook.
+
+    Pending journal records are folded in by the same save, under the journal
+    lock, so no older journaled value can land after these edits.
+    """
+    from .exLoadoutJournal import write_through_journal
+    return write_through_journal(full_excel_path, sheet_name, edits)
+
 class AnyType(str):
     def __ne__(self, __value: object) -> bool:
         return False
@@ -65,6 +182,9 @@ class exLoadoutEditCell:
                 ),
                 "new_value": ("STRING", {"default": ""}),
             },
+            "optional": {
+                "write_mode": (["direct", "journal"], {"default": "direct"}),
+            },
         }
 
     RETURN_TYPES = (ANY,)
@@ -74,10 +194,11 @@ class exLoadoutEditCell:
     CATEGORY = "exLoadout"
     DESCRIPTION = (
         "Edits a specific cell in an Excel spreadsheet and returns the entire row's values "
-        "from columns A to L as a comma-separated string inside a list."
+        "from columns A to L as a comma-separated string inside a list. "
+        "In journal mode the edit is appended to a small sidecar log and folded into the workbook later."
     )
 
-    def edit_excel_cell(self, excel_path, sheet_name, row_number, column_letter, new_value):
+    def edit_excel_cell(self, excel_path, sheet_name, row_number, column_letter, new_value, write_mode="direct"):
         # ✅ Secure path resolution for Excel file - look in current directory
         full_excel_path = get_excel_full_path_or_raise(".", excel_path)
 
@@ -92,37 +213,12 @@ class exLoadoutEditCell:
                                   f"Expected location: {full_excel_path}\n"
                                   f"Make sure the file exists in: {base_dir}")
 
-        # Load the workbook
-        workbook = openpyxl.load_workbook(full_excel_path)
-        if sheet_name not in workbook.sheetnames:
-            workbook.close()
-            raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
-
-        sheet = workbook[sheet_name]
-        column_index = openpyxl.utils.column_index_from_string(column_letter)
-
-        if row_number < 1 or row_number > sheet.max_row:
-            workbook.close()
-            raise ValueError(f"Row {row_number} is out of range. The sheet has {sheet.max_row} rows.")
-
-        if column_index < 1 or column_index > 12:
-            workbook.close()
-            raise ValueError(f"Column '{column_letter}' is out of the allowed range A-L.")
-
-        # Edit the cell
-        sheet.cell(row=row_number, column=column_index).value = new_value
-        workbook.save(full_excel_path)
-
-        # Retrieve updated row values from A–L
-        row_values = []
-        for col_idx in range(1, 13):
-            cell_value = sheet.cell(row=row_number, column=col_idx).value
-            col_letter = openpyxl.utils.get_column_letter(col_idx)
-            row_values.append(f"{col_letter}{row_number}: {str(cell_value)}")
-
-        workbook.close()
-        output_string = ", ".join(row_values)
-        return ([output_string],)
+        if write_mode == "journal":
+            from .exLoadoutJournal import append_edits
+            row_strings = append_edits(full_excel_path, sheet_name, [(row_number, column_letter, new_value)])
+        else:
+            row_strings = apply_cell_edits(full_excel_path, sheet_name, [(row_number, column_letter, new_value)])
+        return ([row_strings[row_number]],)
 
     def create_edit_button(self):
         root = tk.Tk()
@@ -1,5 +1,6 @@
-import openpyxl
 import os
+from .exLoadoutSnapshot import load_snapshot
+from .exLoadoutA import parse_column_selection
 
 def get_excel_full_path_or_raise(base_folder, file_path):
     """
@@ -59,7 +60,10 @@ class exLoadoutSeg2:
                 "sheet_name": ("STRING", {"default": "KSAMPLER"}),
                 "row_number": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1}),
                 "search_string": ("STRING", {"default": ""}),
-            }
+            },
+            "optional": {
+                "columns": ("STRING", {"default": ""}),
+            },
         }
 
     RETURN_TYPES = (ANY, ANY, ANY, ANY, ANY, ANY, "STRING")
@@ -68,10 +72,11 @@ class exLoadoutSeg2:
     FUNCTION = "process_excel"
     CATEGORY = "exLoadout"
     DESCRIPTION = ("Reads values from columns G through L for a specified row number in an Excel spreadsheet. "
-                   "Can also search for a string in Column A.")
+                   "Can also search for a string in Column A. "
+                   "columns (e.g. 'H, J' or 'Outputs') limits which outputs are read and formatted; the rest are left empty.")
     NAME = "exLoadoutSeg2 (List)"
 
-    def process_excel(self, excel_path, sheet_name, row_number, search_string):
+    def process_excel(self, excel_path, sheet_name, row_number, search_string, columns=""):
         # Secure path resolution for Excel file - look in current directory
         full_excel_path = get_excel_full_path_or_raise(".", excel_path)
 
@@ -86,9 +91,8 @@ class exLoadoutSeg2:
                                   f"Expected location: {full_excel_path}\n"
                                   f"Make sure the file exists in: {base_dir}")
 
-        workbook = openpyxl.load_workbook(full_excel_path)
-        if sheet_name not in workbook.sheetnames:
-            workbook.close()
+        workbook = load_snapshot(full_excel_path)
+        if sheet_name not in workbook:
             raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
 
         sheet = workbook[sheet_name]
@@ -96,31 +100,27 @@ class exLoadoutSeg2:
         # Determine actual row based on search
         actual_row = row_number
         if search_string:
-            found = False
-            for row_idx in range(1, sheet.max_row + 1):
-                cell_value = sheet.cell(row=row_idx, column=1).value
-                if cell_value is not None and str(cell_value).strip() == search_string:
-                    actual_row = row_idx
-                    found = True
-                    break
-            if not found:
-                workbook.close()
+            actual_row = sheet.find_row(search_string)
+            if actual_row is None:
                 raise ValueError(f"Search string '{search_string}' not found in Column A.")
 
         if actual_row < 1 or actual_row > sheet.max_row:
-            workbook.close()
             raise ValueError(f"Row number {actual_row} is out of range. The sheet has {sheet.max_row} rows.")
 
-        # Read columns G to L (7 to 12)
-        row_data = [sheet.cell(row=actual_row, column=col_idx).value for col_idx in range(7, 13)]
-        row_data = ['' if value is None else value for value in row_data]
-
-        workbook.close()
-
-        outputs_summary = (
-            f"%G: {row_data[0]} %H: {row_data[1]} %I: {row_data[2]} "
-            f"%J: {row_data[3]} %K: {row_data[4]} %L: {row_data[5]} %"
-        )
+        # Read columns G to L (7 to 12); only the selected ones, the others are left empty
+        selected, summary = parse_column_selection(columns, 7)
+        found_row = sheet.row(actual_row)
+        row_data = []
+        for offset in range(6):
+            value = found_row[7 + offset] if offset in selected else None
+            row_data.append('' if value is None else value)
+
+        outputs_summary = ''
+        if summary:
+            outputs_summary = (
+                f"%G: {row_data[0]} %H: {row_data[1]} %I: {row_data[2]} "
+                f"%J: {row_data[3]} %K: {row_data[4]} %L: {row_data[5]} %"
+            )
 
         return ([row_data[0]], [row_data[1]], [row_data[2]],
                 [row_data[3]], [row_data[4]], [row_data[5]], outputs_summary)
@@ -0,0 +1,362 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from .exLoadoutSnapshot import RowView, invalidate_snapshot, load_snapshot
+from .exLoadoutEditCell import check_edit, check_value, format_row, write_workbook_edits
+
+try:
+    import fcntl
+except ImportError:  # Windows: compaction is serialized within the process only
+    fcntl = None
+
+# Compaction thresholds, overridable through the environment
+MAX_RECORDS = int(os.environ.get("EXLOADOUT_JOURNAL_MAX_RECORDS", "100"))
+MAX_AGE_SECONDS = float(os.environ.get("EXLOADOUT_JOURNAL_MAX_AGE", "30"))
+
+# Serializes appends and compaction within the process
+_compact_lock = threading.RLock()
+
+def journal_paths(full_excel_path):
+    """Returns (journal path, compacting path) for a workbook."""
+    return f"{full_excel_path}.journal", f"{full_excel_path}.journal.compacting"
+
+def read_records(path):
+    """Reads journal records from path. A torn last line from a crash mid-append is skipped."""
+    records = []
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return records
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            print(f"Warning: Skipping unreadable journal record {line_number} in {os.path.basename(path)}")
+    return records
+
+@contextmanager
+def journal_lock(full_excel_path):
+    """
+    Holds the journal lock: in-process, plus an flock on .journal.lock shared with other processes.
+
+    Appends and compaction both take it, so a record can never be appended to a
+    journal that is being renamed and removed by another worker.
+    """
+    journal_path, _ = journal_paths(full_excel_path)
+    with _compact_lock:
+        with open(f"{journal_path}.lock", "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+class OverlaySheet:
+    """A snapshot sheet with journaled edits applied on top. Mirrors SheetSnapshot."""
+    __slots__ = ("title", "max_row", "max_column", "_base", "_overrides", "_key_index")
+
+    def __init__(self, base):
+        self._base = base
+        self._overrides = {}
+        self._key_index = None
+        self.title = base.title
+        self.max_row = base.max_row
+        self.max_column = base.max_column
+
+    def set(self, row, column, value):
+        self._overrides[(row, column)] = value
+        self.max_column = max(self.max_column, column)
+        if column == 1:
+            self._key_index = None
+
+    def value(self, row, column):
+        if (row, column) in self._overrides:
+            return self._overrides[(row, column)]
+        return self._base.value(row, column)
+
+    def row(self, row_number):
+        return RowView(self, row_number)
+
+    def column_values(self, column, min_row=1):
+        values = self._base.column_values(column, min_row)
+        for (row, col), value in self._overrides.items():
+            if col == column and row >= min_row:
+                values[row - min_row] = value
+        return values
+
+    def find_row(self, key):
+        if not any(col == 1 for _, col in self._overrides):
+            return self._base.find_row(key)
+        if self._key_index is None:
+            index = {}
+            for row_idx, value in enumerate(self.column_values(1), start=1):
+                if value is not None:
+                    index.setdefault(str(value).strip(), row_idx)
+            self._key_index = index
+        return self._key_index.get(key)
+
+class OverlaySnapshot:
+    """A workbook snapshot with the pending journal applied on top."""
+
+    def __init__(self, base):
+        self.base = base
+        self.path = base.path
+        self.data_only = base.data_only
+        self.sheets = dict(base.sheets)
+
+    @property
+    def sheetnames(self):
+        return list(self.sheets)
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self.sheets
+
+    def __getitem__(self, sheet_name):
+        return self.sheets[sheet_name]
+
+    def overlay_sheet(self, sheet_name):
+        sheet = self.sheets[sheet_name]
+        if not isinstance(sheet, OverlaySheet):
+            sheet = OverlaySheet(sheet)
+            self.sheets[sheet_name] = sheet
+        return sheet
+
+    def memory_usage(self):
+        return self.base.memory_usage()
+
+def apply_records(base, records):
+    """
+    Replays journal records over a snapshot in order.
+
+    Records that no longer fit the workbook (missing sheet, key or row) or hold a value
+    Excel cannot store are skipped with a warning, so one bad record never blocks compaction.
+
+    Returns:
+        tuple: (OverlaySnapshot, [(sheet name, row number, column letter, value), ...] for the applied records)
+    """
+    overlay = OverlaySnapshot(base)
+    applied = []
+    for record in records:
+        sheet_name = record.get("sheet")
+        if sheet_name not in overlay:
+            print(f"Warning: Journal record for missing sheet '{sheet_name}' skipped")
+            continue
+        sheet = overlay.overlay_sheet(sheet_name)
+        row_number = record.get("row")
+        if row_number is None:
+            row_number = sheet.find_row(record.get("key"))
+        try:
+            if row_number is None:
+                raise ValueError(f"Loadout '{record.get('key')}' not found in Column A.")
+            column_index = check_edit(sheet.max_row, row_number, record.get("column", ""))
+            check_value(record.get("value"))
+        except ValueError as e:
+            print(f"Warning: Journal record skipped: {e}")
+            continue
+        sheet.set(row_number, column_index, record.get("value"))
+        applied.append((sheet_name, row_number, record["column"], record.get("value")))
+    return overlay, applied
+
+_overlays = {}
+_overlays_lock = threading.Lock()
+
+def overlay_journal(snapshot):
+    """
+    Returns snapshot with any pending journal records applied, or snapshot itself if there are none.
+
+    Called by load_snapshot; overlays are cached until the journal files change.
+    """
+    journal_path, compacting_path = journal_paths(snapshot.path)
+    signature = (_file_signature(compacting_path), _file_signature(journal_path))
+    if signature == (None, None):
+        return snapshot
+
+    key = (snapshot.path, snapshot.data_only)
+    with _overlays_lock:
+        cached = _overlays.get(key)
+        if cached is not None and cached[0] is snapshot and cached[1] == signature:
+            return cached[2]
+
+    # Records being compacted come first; they are older than anything in the live journal
+    records = read_records(compacting_path) + read_records(journal_path)
+    overlay, _ = apply_records(snapshot, records)
+    with _overlays_lock:
+        _overlays[key] = (snapshot, signature, overlay)
+
+    # A journal left behind by a crash gets folded in by the background compactor
+    start_compactor(snapshot.path)
+    return overlay
+
+def append_edits(full_excel_path, sheet_name, edits):
+    """
+    Appends edits to the workbook's journal instead of rewriting the .xlsx.
+
+    Each edit and value is validated against the current (journaled) snapshot,
+    then written as one JSON line and fsynced.
+
+    Args:
+        full_excel_path: Absolute path of an already validated .xlsx file
+        sheet_name: The sheet to edit
+        edits: Iterable of (row number or Column A key, column_letter, new_value) tuples
+
+    Returns:
+        dict: Row number -> updated row string (see format_row) for every edited row
+    """
+    workbook = load_snapshot(full_excel_path)
+    if sheet_name not in workbook:
+        raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+    # Later edits in the batch see earlier ones, e.g. a rename followed by an edit by the new key
+    pending = OverlaySheet(workbook[sheet_name])
+
+    now = time.time()
+    lines = []
+    rows = []
+    for row_or_key, column_letter, new_value in edits:
+        record = {"sheet": sheet_name, "column": column_letter, "value": new_value, "ts": now}
+        if isinstance(row_or_key, str):
+            row_number = pending.find_row(row_or_key)
+            if row_number is None:
+                raise ValueError(f"Loadout '{row_or_key}' not found in Column A.")
+            record["key"] = row_or_key
+        else:
+            row_number = row_or_key
+            record["row"] = row_number
+        check_value(new_value)
+        pending.set(row_number, check_edit(pending.max_row, row_number, column_letter), new_value)
+        lines.append(json.dumps(record, default=str) + "\n")
+        rows.append(row_number)
+
+    journal_path, _ = journal_paths(full_excel_path)
+    with journal_lock(full_excel_path):
+        with open(journal_path, "ab") as f:
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+    start_compactor(full_excel_path)
+
+    sheet = load_snapshot(full_excel_path)[sheet_name]
+    return {row_number: format_row(row_number, sheet.row(row_number).values(1, 12)) for row_number in rows}
+
+def _compact_locked(full_excel_path, sheet_name=None, edits=()):
+    """
+    Folds the journal into the .xlsx, plus optional direct edits, with one save. The caller holds journal_lock.
+
+    Returns:
+        tuple: (number of journal records written, {row number: row string} for the direct edits)
+    """
+    journal_path, compacting_path = journal_paths(full_excel_path)
+    if not os.path.exists(compacting_path) and os.path.exists(journal_path):
+        os.replace(journal_path, compacting_path)
+
+    applied = []
+    if os.path.exists(compacting_path):
+        records = read_records(compacting_path)
+        _, applied = apply_records(load_snapshot(full_excel_path, with_journal=False), records)
+
+    edits_by_sheet = {}
+    for record_sheet, row_number, column_letter, value in applied:
+        edits_by_sheet.setdefault(record_sheet, []).append((row_number, column_letter, value))
+    edits = list(edits)
+    if edits:
+        # After the journaled records, so the direct edits win
+        edits_by_sheet.setdefault(sheet_name, []).extend(edits)
+
+    rows = {}
+    if edits_by_sheet:
+        rows = write_workbook_edits(full_excel_path, edits_by_sheet).get(sheet_name, {})
+        if edits:
+            rows = {row_number: rows[row_number] for row_number, _, _ in edits}
+    if os.path.exists(compacting_path):
+        os.remove(compacting_path)
+        invalidate_snapshot(full_excel_path)
+    return len(applied), rows
+
+def compact_journal(full_excel_path):
+    """
+    Folds the journal into the .xlsx and removes it.
+
+    The live journal is first renamed to a .compacting file, so new edits keep
+    going to a fresh journal while the workbook is saved. A .compacting file
+    left by a crash is replayed before anything else. Replaying is idempotent.
+
+    Returns:
+        int: Number of records written into the workbook
+    """
+    journal_path, compacting_path = journal_paths(full_excel_path)
+    if not os.path.exists(journal_path) and not os.path.exists(compacting_path):
+        return 0
+
+    with journal_lock(full_excel_path):
+        return _compact_locked(full_excel_path)[0]
+
+def write_through_journal(full_excel_path, sheet_name, edits):
+    """
+    Saves direct edits together with any pending journal records, under the journal lock.
+
+    Holding the lock across both means a concurrent append is either folded in
+    before these edits or lands in the journal after them, never in between.
+
+    Returns:
+        dict: Row number -> updated row string (see format_row) for every edited row
+    """
+    with journal_lock(full_excel_path):
+        return _compact_locked(full_excel_path, sheet_name, edits)[1]
+
+class JournalCompactor(threading.Thread):
+    """Background thread that compacts journals once they reach MAX_RECORDS records or MAX_AGE_SECONDS."""
+
+    def __init__(self):
+        super().__init__(name="exLoadoutJournalCompactor", daemon=True)
+        self.paths = set()
+        self.wake = threading.Event()
+
+    def run(self):
+        while True:
+            self.wake.wait(timeout=min(MAX_AGE_SECONDS, 5.0))
+            self.wake.clear()
+            for full_excel_path in list(self.paths):
+                try:
+                    if self.is_due(full_excel_path):
+                        compact_journal(full_excel_path)
+                    self.forget_if_done(full_excel_path)
+                except Exception as e:
+                    print(f"Warning: Journal compaction failed for {os.path.basename(full_excel_path)}: {e}")
+
+    def forget_if_done(self, full_excel_path):
+        """Stops watching a workbook without journal files. Checked under the lock start_compactor takes, so a new append is never dropped."""
+        with _compactor_lock:
+            if not any(os.path.exists(path) for path in journal_paths(full_excel_path)):
+                self.paths.discard(full_excel_path)
+
+    @staticmethod
+    def is_due(full_excel_path):
+        journal_path, compacting_path = journal_paths(full_excel_path)
+        if os.path.exists(compacting_path):
+            return True  # Interrupted compaction
+        records = read_records(journal_path)
+        if not records:
+            return False
+        return len(records) >= MAX_RECORDS or time.time() - records[0].get("ts", 0) >= MAX_AGE_SECONDS
+
+_compactor = None
+_compactor_lock = threading.Lock()
+
+def start_compactor(full_excel_path):
+    """Makes sure the background compactor is running and watching full_excel_path."""
+    global _compactor
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = JournalCompactor()
+            _compactor.start()
+        _compactor.paths.add(full_excel_path)
+    _compactor.wake.set()
@@ -0,0 +1,188 @@
+import os
+import threading
+from collections import OrderedDict
+import openpyxl
+from folder_paths import get_full_path_or_raise
+import comfy.sd
+import comfy.utils
+from .exLoadoutSnapshot import load_snapshot
+from .exLoadoutModelIndex import get_filename_set
+
+def get_excel_full_path_or_raise(base_folder, file_path):
+    """
+    Securely resolve Excel file paths within a designated directory.
+
+    Args:
+        base_folder: The base folder name (use "." for current directory)
+        file_path: The requested file path
+
+    Returns:
+        str: The absolute path if valid
+
+    Raises:
+        ValueError: If the path is invalid or outside the allowed directory
+    """
+    # Get the directory where the script is located
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # If base_folder is ".", use the current directory, otherwise create subdirectory path
+    if base_folder == ".":
+        base_dir = current_dir
+    else:
+        base_dir = os.path.join(current_dir, base_folder)
+
+    # Normalize the file path to prevent directory traversal
+    normalized_file_path = os.path.normpath(file_path)
+
+    # Check for directory traversal attempts
+    if os.path.isabs(normalized_file_path) or normalized_file_path.startswith('..'):
+        raise ValueError("Invalid file path. Absolute paths and parent directory references are not allowed.")
+
+    # Construct the full path
+    full_path = os.path.join(base_dir, normalized_file_path)
+
+    # Resolve any remaining relative components
+    resolved_path = os.path.abspath(full_path)
+
+    # Ensure the resolved path is still within the base directory
+    if not resolved_path.startswith(os.path.abspath(base_dir)):
+        raise ValueError("Invalid file path. Path must be within the designated directory.")
+
+    return resolved_path
+
+# LoRA state dicts keyed by (path, mtime_ns, size), most recently used last
+_lora_cache = OrderedDict()
+_lora_cache_lock = threading.Lock()
+
+def load_lora_cached(lora_path, cache_size):
+    """
+    Loads a LoRA state dict, reusing a cached copy while the file is unchanged.
+
+    Args:
+        lora_path: Absolute path of the LoRA file
+        cache_size: Maximum number of LoRAs kept in memory (0 disables caching)
+
+    Returns:
+        dict: The LoRA state dict
+    """
+    stat = os.stat(lora_path)
+    key = (lora_path, stat.st_mtime_ns, stat.st_size)
+    with _lora_cache_lock:
+        lora = _lora_cache.get(key)
+        if lora is not None:
+            _lora_cache.move_to_end(key)
+            return lora
+
+    lora = comfy.utils.load_torch_file(lora_path, safe_load=True)
+
+    with _lora_cache_lock:
+        # Drop stale versions of the same file before inserting the new one
+        for stale_key in [k for k in _lora_cache if k[0] == lora_path]:
+            del _lora_cache[stale_key]
+        if cache_size > 0:
+            _lora_cache[key] = lora
+            while len(_lora_cache) > cache_size:
+                _lora_cache.popitem(last=False)
+    return lora
+
+def parse_lora_columns(lora_columns):
+    """
+    Parses a column spec such as "E:F, G:H" into [(name column, strength column), ...] indexes.
+
+    A pair without a strength column ("E") uses a strength of 1.0.
+    """
+    pairs = []
+    for part in lora_columns.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        letters = [letter.strip().upper() for letter in part.split(":")]
+        if len(letters) > 2:
+            raise ValueError(f"Invalid LoRA column pair '{part}'. Use NAME:STRENGTH, e.g. E:F.")
+        try:
+            name_column = openpyxl.utils.column_index_from_string(letters[0])
+            strength_column = openpyxl.utils.column_index_from_string(letters[1]) if len(letters) == 2 and letters[1] else None
+        except ValueError:
+            raise ValueError(f"Invalid column letter in LoRA column pair '{part}'.")
+        pairs.append((name_column, strength_column))
+    return pairs
+
+class exLoadoutLoraStack:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "model": ("MODEL",),
+                "clip": ("CLIP",),
+                "excel_path": ("STRING", {"default": "exLoadoutList.xlsx"}),
+                "sheet_name": ("STRING", {"default": "MODELS"}),
+                "loadout_name": ("STRING", {"default": ""}),
+                "lora_columns": ("STRING", {"default": "E:F, G:H, I:J"}),
+            },
+            "optional": {
+                "cache_size": ("INT", {"default": 8, "min": 0, "max": 128}),
+            },
+        }
+
+    RETURN_TYPES = ("MODEL", "CLIP", "STRING")
+    RETURN_NAMES = ("model", "clip", "Output")
+    FUNCTION = "apply_lora_stack"
+    CATEGORY = "exLoadout"
+    DESCRIPTION = (
+        "Applies the LoRAs of a loadout to MODEL and CLIP. lora_columns lists NAME:STRENGTH column pairs "
+        "(e.g. 'E:F, G:H'); empty name cells are skipped and empty strengths default to 1.0. "
+        "Loaded LoRAs are cached so switching between loadouts that share LoRAs does not re-read them from disk."
+    )
+
+    def apply_lora_stack(self, model, clip, excel_path, sheet_name, loadout_name, lora_columns, cache_size=8):
+        # Secure path resolution for Excel file - look in current directory
+        full_excel_path = get_excel_full_path_or_raise(".", excel_path)
+
+        # Validate file extension
+        if not full_excel_path.lower().endswith(".xlsx"):
+            raise ValueError("Invalid file type. Only .xlsx files are supported.")
+
+        # Check if file exists
+        if not os.path.exists(full_excel_path):
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            raise FileNotFoundError(f"Excel file not found: {os.path.basename(full_excel_path)}\n"
+                                  f"Expected location: {full_excel_path}\n"
+                                  f"Make sure the file exists in: {base_dir}")
+
+        workbook = load_snapshot(full_excel_path)
+        if sheet_name not in workbook:
+            raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+
+        sheet = workbook[sheet_name]
+        row_number = sheet.find_row(loadout_name)
+        if row_number is None:
+            raise ValueError(f"Loadout '{loadout_name}' not found in Column A.")
+        found_row = sheet.row(row_number)
+
+        applied = []
+        for name_column, strength_column in parse_lora_columns(lora_columns):
+            if not found_row[name_column]:
+                continue
+            lora_name = str(found_row[name_column]).strip()
+            if lora_name not in get_filename_set("loras"):
+                raise ValueError(f"LoRA '{lora_name}' is not in the allowed loras list.")
+
+            strength = found_row[strength_column] if strength_column else None
+            try:
+                strength = 1.0 if strength in (None, "") else float(strength)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid strength '{strength}' for LoRA '{lora_name}'.")
+            if strength == 0:
+                continue
+
+            # Use ComfyUI's secure path resolution for LoRA files
+            lora_path = get_full_path_or_raise("loras", lora_name)
+            lora = load_lora_cached(lora_path, cache_size)
+            model, clip = comfy.sd.load_lora_for_models(model, clip, lora, strength, strength)
+            applied.append(f"{lora_name} ({strength:g})")
+
+        debug_output = f"Loadout: {loadout_name}, LoRAs: {', '.join(applied) if applied else 'None'}"
+        return (model, clip, debug_output)
+
+NODE_CLASS_MAPPINGS = {"exLoadoutLoraStack": exLoadoutLoraStack}
+NODE_DISPLAY_NAME_MAPPINGS = {"exLoadoutLoraStack": "exLoadout LoRA Stack"}
@@ -0,0 +1,64 @@
+import os
+import threading
+
+_filename_sets = {}
+_filename_sets_lock = threading.Lock()
+
+def _watched_directories(base_dirs):
+    """
+    Returns every directory under base_dirs, as visited by os.walk.
+
+    Adding or removing a model changes the mtime of the directory holding it,
+    including intermediate directories that hold no models yet.
+    """
+    directories = set()
+    for base_dir in base_dirs:
+        for directory, _, _ in os.walk(base_dir, followlinks=True):
+            directories.add(directory)
+        directories.add(base_dir)  # Watched even while missing, so its creation is noticed
+    return tuple(sorted(directories))
+
+def _mtimes(directories):
+    mtimes = []
+    for directory in directories:
+        try:
+            mtimes.append(os.stat(directory).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def get_filename_set(folder_name):
+    """
+    Returns the model filenames of a ComfyUI folder as a cached frozenset.
+
+    The set is rebuilt only when one of the folder's directories changes, so
+    membership checks cost O(1) instead of a list scan on every prompt.
+
+    Args:
+        folder_name: A folder_paths key such as "checkpoints", "text_encoders" or "vae"
+
+    Returns:
+        frozenset: Relative filenames as listed by folder_paths.get_filename_list
+    """
+    # Imported lazily so the validation CLI can put ComfyUI on sys.path first
+    import folder_paths
+
+    base_dirs = tuple(folder_paths.get_folder_paths(folder_name))
+    with _filename_sets_lock:
+        cached = _filename_sets.get(folder_name)
+        if cached is not None:
+            cached_base_dirs, directories, mtimes, filenames = cached
+            if cached_base_dirs == base_dirs and _mtimes(directories) == mtimes:
+                return filenames
+
+        # mtimes are taken before listing, so a model added meanwhile triggers another rebuild
+        directories = _watched_directories(base_dirs)
+        mtimes = _mtimes(directories)
+        filenames = frozenset(folder_paths.get_filename_list(folder_name))
+        _filename_sets[folder_name] = (base_dirs, directories, mtimes, filenames)
+        return filenames
+
+def clear_filename_sets():
+    """Forgets every cached filename set."""
+    with _filename_sets_lock:
+        _filename_sets.clear()
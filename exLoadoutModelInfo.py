@@ -0,0 +1,192 @@
+import json
+import os
+import struct
+import threading
+
+# Refuse absurd header sizes instead of reading a whole corrupt file into memory
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+DTYPE_SIZES = {
+    "F64": 8, "F32": 4, "F16": 2, "BF16": 2, "F8_E4M3": 1, "F8_E5M2": 1,
+    "I64": 8, "I32": 4, "I16": 2, "I8": 1, "U64": 8, "U32": 4, "U16": 2, "U8": 1, "BOOL": 1,
+}
+
+# Families that map directly onto a clip_type of exLoadoutCheckpointLoader
+FAMILY_CLIP_TYPES = {
+    "sd1": "stable_diffusion",
+    "sd2": "stable_diffusion",
+    "sdxl": "stable_diffusion",
+    "sd3": "sd3",
+    "wan": "wan",
+}
+
+# Standalone component families and the key prefixes every tensor of such a file starts with.
+# A file with any other key (e.g. a bundled diffusion model) is never classed as standalone.
+STANDALONE_PREFIXES = {
+    "vae": ("encoder.", "decoder.", "quant_conv.", "post_quant_conv."),
+    "t5": ("encoder.", "shared.", "spiece_model"),
+    "clip": ("text_model.", "text_projection", "logit_scale"),
+}
+
+class ModelInfo:
+    """Summary of a .safetensors file built from its JSON header alone."""
+    __slots__ = ("path", "file_size", "tensor_count", "parameter_count", "total_bytes",
+                 "dtypes", "family", "components", "metadata")
+
+    def __init__(self, path, file_size, tensors, metadata):
+        self.path = path
+        self.file_size = file_size
+        self.tensor_count = len(tensors)
+        self.parameter_count = 0
+        self.total_bytes = 0
+        self.dtypes = {}
+        for tensor in tensors.values():
+            count = 1
+            for dim in tensor.get("shape", []):
+                count *= dim
+            self.parameter_count += count
+            dtype = tensor.get("dtype", "?")
+            if "data_offsets" in tensor:
+                begin, end = tensor["data_offsets"]
+                self.total_bytes += end - begin
+            else:
+                self.total_bytes += count * DTYPE_SIZES.get(dtype, 0)
+            self.dtypes[dtype] = self.dtypes.get(dtype, 0) + count
+        self.family, self.components = detect_family(tensors)
+        self.metadata = metadata
+
+    @property
+    def main_dtype(self):
+        """The dtype holding the most parameters."""
+        return max(self.dtypes, key=self.dtypes.get) if self.dtypes else None
+
+    @property
+    def clip_type(self):
+        """The clip_type suggested for this family, or None if unknown."""
+        return FAMILY_CLIP_TYPES.get(self.family)
+
+    @property
+    def is_checkpoint(self):
+        """False only when every tensor belongs to a standalone text encoder or VAE."""
+        return self.family not in ("vae", "t5", "clip_l", "clip_g")
+
+    def summary(self):
+        return (f"{self.family or 'unknown'}, {self.total_bytes / 1024 ** 3:.2f} GB, "
+                f"{self.parameter_count / 1e9:.2f}B params ({self.main_dtype}), {self.tensor_count} tensors")
+
+def read_safetensors_header(path):
+    """
+    Reads only the JSON header of a .safetensors file.
+
+    Returns:
+        dict: The parsed header (tensor name -> {"dtype", "shape", "data_offsets"}, plus "__metadata__")
+
+    Raises:
+        ValueError: If the file is not a valid safetensors file
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError(f"File too small to be a safetensors file: {os.path.basename(path)}")
+        header_size = struct.unpack("<Q", prefix)[0]
+        if header_size > MAX_HEADER_BYTES:
+            raise ValueError(f"Safetensors header too large in {os.path.basename(path)}")
+        data = f.read(header_size)
+    if len(data) != header_size:
+        raise ValueError(f"Truncated safetensors header in {os.path.basename(path)}")
+    try:
+        header = json.loads(data)
+    except ValueError:
+        raise ValueError(f"Invalid safetensors header in {os.path.basename(path)}")
+    if not isinstance(header, dict):
+        raise ValueError(f"Invalid safetensors header in {os.path.basename(path)}")
+    return header
+
+def detect_family(tensors):
+    """
+    Guesses the model family and contained components from tensor names and shapes.
+
+    Returns:
+        tuple: (family name or None, sorted list of components such as "unet", "text_encoder", "vae")
+    """
+    names = tensors.keys()
+
+    def has(fragment):
+        return any(fragment in name for name in names)
+
+    def only(component):
+        return all(name.startswith(STANDALONE_PREFIXES[component]) for name in names)
+
+    components = set()
+    if has("first_stage_model.") or (has("decoder.up") and has("encoder.down")):
+        components.add("vae")
+    if has("cond_stage_model.") or has("conditioner.") or has("text_encoders.") or has("text_model.encoder") or has("encoder.block."):
+        components.add("text_encoder")
+    if has("diffusion_model.") or has("model.model."):
+        components.add("unet")
+
+    family = None
+    if has("double_blocks.") and has("single_blocks."):
+        family = "flux"
+    elif has("joint_blocks."):
+        family = "sd3"
+    elif has("patch_embedding") and has("blocks.0.cross_attn"):
+        family = "wan"
+    elif has("input_blocks.") or has("down_blocks."):
+        if has("conditioner.embedders") or has("label_emb"):
+            family = "sdxl"
+        elif has("cond_stage_model.model.transformer"):
+            family = "sd2"
+        else:
+            family = "sd1"
+    elif "unet" in components:
+        pass  # A diffusion model of an architecture not recognized here
+    elif only("t5") and has("encoder.block."):
+        family = "t5"
+    elif only("clip") and has("text_model.encoder.layers"):
+        embedding = next((tensor for name, tensor in tensors.items() if name.endswith("token_embedding.weight")), None)
+        width = embedding["shape"][-1] if embedding and embedding.get("shape") else None
+        family = "clip_g" if width == 1280 else "clip_l"
+    elif only("vae") and "vae" in components:
+        family = "vae"
+
+    if family in ("flux", "sd3", "wan", "sd1", "sd2", "sdxl"):
+        components.add("unet")
+    return family, sorted(components)
+
+_info_cache = {}
+_info_cache_lock = threading.Lock()
+
+def get_model_info(path):
+    """
+    Returns the ModelInfo of a .safetensors file, cached by path, mtime and size.
+
+    Only the header is read, so this costs a few kilobytes of I/O however large the model is.
+
+    Returns:
+        ModelInfo or None: None for other file types or unreadable files
+    """
+    if not path.lower().endswith(".safetensors"):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _info_cache_lock:
+        cached = _info_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    try:
+        header = read_safetensors_header(path)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read safetensors header of '{os.path.basename(path)}': {e}")
+        return None
+    metadata = header.pop("__metadata__", None) or {}
+    info = ModelInfo(path, stat.st_size, header, metadata)
+
+    with _info_cache_lock:
+        _info_cache[path] = (key, info)
+    return info
@@ -1,5 +1,6 @@
 import openpyxl
 import os
+from .exLoadoutSnapshot import load_snapshot
 
 class AnyType(str):
     def __ne__(self, __value: object) -> bool:
@@ -82,11 +83,10 @@ class exLoadoutReadColumn:
                                   f"Expected location: {full_excel_path}\n"
                                   f"Make sure the file exists in: {base_dir}")
         
-        # Load the Excel workbook
-        workbook = openpyxl.load_workbook(full_excel_path, data_only=True)
+        # Load the cached workbook snapshot
+        workbook = load_snapshot(full_excel_path, data_only=True)
         
-        if sheet_name not in workbook.sheetnames:
-            workbook.close()
+        if sheet_name not in workbook:
             raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
         
         sheet = workbook[sheet_name]
@@ -95,18 +95,15 @@ class exLoadoutReadColumn:
         try:
             column_index = openpyxl.utils.column_index_from_string(column_letter)
         except ValueError:
-            workbook.close()
             raise ValueError(f"Invalid column letter: {column_letter}")
         
         # Read all non-empty values in the column, excluding the header
         values = [
-            str(sheet.cell(row=row_idx, column=column_index).value)
-            for row_idx in range(2, sheet.max_row + 1)  # Start from row 2 to skip header
-            if sheet.cell(row=row_idx, column=column_index).value is not None
+            str(value)
+            for value in sheet.column_values(column_index, min_row=2)  # Start from row 2 to skip header
+            if value is not None
         ]
         
-        workbook.close()
-        
         # Join values into a single comma-separated string
         output_string = ", ".join(values)
         return ([output_string],)  # Output as a list
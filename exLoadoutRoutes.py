@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import json
+import os
+import openpyxl
+from aiohttp import web
+from .exLoadoutSnapshot import load_snapshot
+from .exLoadoutSelector import column_a_options, get_excel_full_path_or_raise
+from .exLoadoutEditCell import apply_cell_edits
+from .exLoadoutJournal import append_edits
+
+# Cell values may be dates or times; send those as strings
+json_dumps = functools.partial(json.dumps, default=str)
+
+def resolve_excel_path(excel_path):
+    """
+    Validates an excel_path query value the same way the nodes do.
+
+    Raises:
+        ValueError: If the path is invalid or not an .xlsx file
+        FileNotFoundError: If the workbook does not exist
+    """
+    full_excel_path = get_excel_full_path_or_raise(".", excel_path)
+    if not full_excel_path.lower().endswith(".xlsx"):
+        raise ValueError("Invalid file type. Only .xlsx files are supported.")
+    if not os.path.exists(full_excel_path):
+        raise FileNotFoundError(f"Excel file not found: {os.path.basename(full_excel_path)}")
+    return full_excel_path
+
+async def run_blocking(func, *args):
+    """Runs blocking workbook I/O in the default executor so the server loop stays responsive."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+def error_response(error):
+    status = 404 if isinstance(error, FileNotFoundError) else 400
+    return web.json_response({"error": str(error)}, status=status)
+
+async def load_request_sheet(params, require_sheet=True):
+    """Returns (snapshot, sheet or None) for the excel_path/sheet_name in params."""
+    full_excel_path = resolve_excel_path(params.get("excel_path", "exLoadoutList.xlsx"))
+    workbook = await run_blocking(load_snapshot, full_excel_path)
+    if not require_sheet:
+        return workbook, None
+    sheet_name = params.get("sheet_name", "")
+    if sheet_name not in workbook:
+        raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+    return workbook, workbook[sheet_name]
+
+async def list_sheets(request):
+    """GET /exloadout/sheets?excel_path=... -> {"sheets": [...]}"""
+    try:
+        workbook, _ = await load_request_sheet(request.query, require_sheet=False)
+    except (ValueError, FileNotFoundError) as e:
+        return error_response(e)
+    return web.json_response({"sheets": workbook.sheetnames})
+
+async def list_options(request):
+    """GET /exloadout/options?excel_path=...&sheet_name=... -> Column A options as the Selector sees them"""
+    try:
+        _, sheet = await load_request_sheet(request.query)
+    except (ValueError, FileNotFoundError) as e:
+        return error_response(e)
+    options, default_value, non_empty_options = column_a_options(sheet)
+    return web.json_response({"options": options, "default": default_value, "non_empty": non_empty_options})
+
+async def get_row(request):
+    """GET /exloadout/row?excel_path=...&sheet_name=...&row_number=N or &search_string=... -> columns A-L"""
+    try:
+        _, sheet = await load_request_sheet(request.query)
+        search_string = request.query.get("search_string", "")
+        if search_string:
+            row_number = sheet.find_row(search_string)
+            if row_number is None:
+                return web.json_response({"error": f"Search string '{search_string}' not found in Column A."}, status=404)
+        else:
+            row_number = int(request.query.get("row_number", "1"))
+        if row_number < 1 or row_number > sheet.max_row:
+            raise ValueError(f"Row number {row_number} is out of range. The sheet has {sheet.max_row} rows.")
+    except (ValueError, FileNotFoundError) as e:
+        return error_response(e)
+
+    values = sheet.row(row_number).values(1, 12)
+    columns = {openpyxl.utils.get_column_letter(col_idx): value for col_idx, value in enumerate(values, start=1)}
+    return web.json_response({"row": row_number, "columns": columns}, dumps=json_dumps)
+
+def write_edits_by_key(full_excel_path, sheet_name, edits):
+    """Resolves Column A keys to row numbers, then saves the edits into the workbook."""
+    workbook = load_snapshot(full_excel_path)
+    if sheet_name not in workbook:
+        raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+    resolved = []
+    for row_or_key, column_letter, new_value in edits:
+        if isinstance(row_or_key, str):
+            row_number = workbook[sheet_name].find_row(row_or_key)
+            if row_number is None:
+                raise ValueError(f"Loadout '{row_or_key}' not found in Column A.")
+            row_or_key = row_number
+        resolved.append((row_or_key, column_letter, new_value))
+    return apply_cell_edits(full_excel_path, sheet_name, resolved)
+
+async def apply_edits(request):
+    """
+    POST /exloadout/edits with a JSON body:
+    {"excel_path": ..., "sheet_name": ..., "journal": false,
+     "edits": [{"row_number": N or "key": "Loadout", "column_letter": "B", "value": ...}, ...]}
+
+    All edits are validated first and written with a single save, or appended
+    to the edit journal when "journal" is true.
+    """
+    try:
+        body = await request.json()
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object.")
+        full_excel_path = resolve_excel_path(body.get("excel_path", "exLoadoutList.xlsx"))
+        if not isinstance(body.get("edits", []), list):
+            raise ValueError("Field 'edits' must be a list.")
+        edits = []
+        for edit in body.get("edits", []):
+            if not isinstance(edit, dict):
+                raise ValueError("Each edit must be a JSON object.")
+            target = str(edit["key"]) if "key" in edit else int(edit["row_number"])
+            edits.append((target, str(edit["column_letter"]), edit.get("value", "")))
+        if not edits:
+            raise ValueError("No edits given.")
+        write = append_edits if body.get("journal") else write_edits_by_key
+        rows = await run_blocking(write, full_excel_path, body.get("sheet_name", ""), edits)
+    except KeyError as e:
+        return error_response(ValueError(f"Missing field: {e.args[0]}"))
+    except (ValueError, TypeError, FileNotFoundError) as e:
+        return error_response(e)
+    return web.json_response({"rows": {str(row_number): row for row_number, row in rows.items()}})
+
+def register_routes(routes):
+    """Adds the exLoadout endpoints to an aiohttp RouteTableDef."""
+    routes.get("/exloadout/sheets")(list_sheets)
+    routes.get("/exloadout/options")(list_options)
+    routes.get("/exloadout/row")(get_row)
+    routes.post("/exloadout/edits")(apply_edits)
+
+def register_server_routes():
+    """Registers the endpoints on ComfyUI's PromptServer when it is running."""
+    try:
+        from server import PromptServer
+    except ImportError:
+        return
+    if getattr(PromptServer, "instance", None) is not None:
+        register_routes(PromptServer.instance.routes)
@@ -1,8 +1,10 @@
-import openpyxl
 import os
 import random
 import time
+from array import array
+import openpyxl
 import comfy.sd
+from .exLoadoutSnapshot import load_snapshot
 
 def get_excel_full_path_or_raise(base_folder, file_path):
     """
@@ -46,10 +48,101 @@ def get_excel_full_path_or_raise(base_folder, file_path):
     
     return resolved_path
 
+def column_a_options(sheet):
+    """
+    Reads Column A of a snapshot sheet, skipping the header row A1.
+    
+    Returns:
+        tuple: (options with "empty" placeholders, default value from A2, non-empty options)
+    """
+    options = []
+    non_empty_options = []
+    first_value = None
+    
+    for cell_value in sheet.column_values(1, min_row=2):  # Start from row 2 to skip header
+        if cell_value is not None:
+            value = str(cell_value).strip()
+            if value:  # Only add non-empty strings
+                options.append(value)
+                non_empty_options.append(value)
+                if first_value is None:  # Store the first non-empty value (A2)
+                    first_value = value
+        else:
+            options.append("empty")
+            if first_value is None:  # If A2 is empty, set first_value to "empty"
+                first_value = "empty"
+    
+    # If no data found, return empty option
+    if not options:
+        options = ["empty"]
+        first_value = "empty"
+    
+    return options, first_value, non_empty_options
+
+class AliasTable:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per weighted draw.
+    """
+    __slots__ = ("probabilities", "aliases")
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        self.probabilities = array("d", [1.0] * count)
+        self.aliases = array("I", range(count))
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left (including rounding leftovers) always keeps its own slot
+
+    def draw(self, rng):
+        index = rng.randrange(len(self.probabilities))
+        return index if rng.random() < self.probabilities[index] else self.aliases[index]
+
+def weighted_entries(sheet, weight_column):
+    """
+    Returns (names, weights) for the non-empty Column A loadouts of a sheet.
+
+    Weights come from weight_column; empty cells count as 1.0, and non-numeric or
+    negative cells as 0. Without a weight column every loadout weighs 1.0.
+    """
+    weight_index = openpyxl.utils.column_index_from_string(weight_column.strip().upper()) if weight_column.strip() else None
+    names, weights = [], []
+    for row_idx in range(2, sheet.max_row + 1):  # Start from row 2 to skip header
+        name = sheet.value(row_idx, 1)
+        name = "" if name is None else str(name).strip()
+        if not name:
+            continue
+        weight = 1.0
+        if weight_index is not None:
+            cell_value = sheet.value(row_idx, weight_index)
+            if cell_value not in (None, ""):
+                try:
+                    weight = max(float(cell_value), 0.0)
+                except (TypeError, ValueError):
+                    print(f"Warning: Ignoring non-numeric weight '{cell_value}' for Loadout '{name}'")
+                    weight = 0.0
+        names.append(name)
+        weights.append(weight)
+    return names, weights
+
 class exLoadoutSelector:
     # Class variable to track the current index for sequential selection
     _current_index = 0
     
+    # Weighted sampling state, rebuilt whenever the sheet snapshot changes
+    _samplers = {}      # (path, sheet, weight column) -> (sheet snapshot, names, alias table)
+    _seeded_rngs = {}   # (path, sheet, weight column) -> (sheet snapshot, seed, random.Random)
+    _permutations = {}  # (path, sheet, weight column) -> [sheet snapshot, seed, order, cursor, epoch]
+    _column_a_cache = {}  # (path, sheet) -> (sheet snapshot, column_a_options result)
+    
     @classmethod
     def NODE_NAME(cls):
         """Sets the node name to 'exLoadout Selector' instead of the class name."""
@@ -67,7 +160,12 @@ class exLoadoutSelector:
                 "excel_path": ("STRING", {"default": excel_path}),
                 "sheet_name": ("STRING", {"default": sheet_name}),
                 "Loadout": (dynamic_options, {"default": default_value}),  # Dynamic options from Excel
-                "selection_mode": (["Random", "Increment", "Decrement"], {"default": "Random"}),  # Selection mode
+                "selection_mode": (["Random", "Increment", "Decrement", "Weighted", "Weighted (Seeded)", "Shuffle (No Replacement)"], {"default": "Random"}),  # Selection mode
+            },
+            "optional": {
+                "weight_column": ("STRING", {"default": ""}),  # Column letter holding weights, empty for equal weights
+                # Not named "seed", so the frontend does not randomize it after every prompt
+                "sample_seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff, "control_after_generate": False}),
             },
         }
     
@@ -75,10 +173,11 @@ class exLoadoutSelector:
     RETURN_NAMES = ("Loadout", "Auto Loadout")
     FUNCTION = "get_selected_loadout"
     CATEGORY = "exLoadout"
-    DESCRIPTION = "Dropdown populated from Column A of an Excel file. Returns the selected Loadout and an auto-selected loadout based on mode."
+    DESCRIPTION = ("Dropdown populated from Column A of an Excel file. Returns the selected Loadout and an auto-selected loadout based on mode. "
+                   "Weighted modes read weights from weight_column; the seeded and shuffle modes are reproducible for a given sample_seed.")
     
     @classmethod
-    def IS_CHANGED(cls, excel_path, sheet_name, Loadout, selection_mode):
+    def IS_CHANGED(cls, excel_path, sheet_name, Loadout, selection_mode, weight_column="", sample_seed=0):
         """This method tells ComfyUI when to refresh the node's options."""
         try:
             full_excel_path = get_excel_full_path_or_raise(".", excel_path)
@@ -114,39 +213,18 @@ class exLoadoutSelector:
             return ["ERROR: FILE NOT FOUND"], "ERROR: FILE NOT FOUND", []
         
         try:
-            workbook = openpyxl.load_workbook(full_excel_path, read_only=True)
-            if sheet_name not in workbook.sheetnames:
-                workbook.close()
+            workbook = load_snapshot(full_excel_path)
+            if sheet_name not in workbook:
                 print(f"Error: Sheet '{sheet_name}' not found in Excel file.")
                 return ["ERROR: SHEET NOT FOUND"], "ERROR: SHEET NOT FOUND", []
             
             sheet = workbook[sheet_name]
+            cached = cls._column_a_cache.get((full_excel_path, sheet_name))
+            if cached is not None and cached[0] is sheet:
+                return cached[1]
             
-            # Read Column A starting from row 2 (skip header row A1)
-            options = []
-            non_empty_options = []
-            first_value = None
-            
-            for row_idx in range(2, sheet.max_row + 1):  # Start from row 2 to skip header
-                cell_value = sheet.cell(row=row_idx, column=1).value
-                if cell_value is not None:
-                    value = str(cell_value).strip()
-                    if value:  # Only add non-empty strings
-                        options.append(value)
-                        non_empty_options.append(value)
-                        if first_value is None:  # Store the first non-empty value (A2)
-                            first_value = value
-                else:
-                    options.append("empty")
-                    if first_value is None:  # If A2 is empty, set first_value to "empty"
-                        first_value = "empty"
-            
-            workbook.close()
-            
-            # If no data found, return empty option
-            if not options:
-                options = ["empty"]
-                first_value = "empty"
+            options, first_value, non_empty_options = column_a_options(sheet)
+            cls._column_a_cache[(full_excel_path, sheet_name)] = (sheet, (options, first_value, non_empty_options))
             
             # Debug print to help troubleshoot
             print(f"Excel options found: {options}")
@@ -165,7 +243,65 @@ class exLoadoutSelector:
         options, first_value, _ = cls.get_excel_data(excel_path, sheet_name)
         return options, first_value
     
-    def get_selected_loadout(self, excel_path, sheet_name, Loadout, selection_mode):
+    @classmethod
+    def get_sampler(cls, full_excel_path, sheet, weight_column):
+        """Returns (names, alias table) for a sheet, building the alias table once per sheet version."""
+        key = (full_excel_path, sheet.title, weight_column)
+        cached = cls._samplers.get(key)
+        if cached is not None and cached[0] is sheet:
+            return cached[1], cached[2]
+        
+        names, weights = weighted_entries(sheet, weight_column)
+        if not any(weights):
+            raise ValueError(f"All weights in column '{weight_column}' are zero or empty.")
+        table = AliasTable(weights)
+        cls._samplers[key] = (sheet, names, table)
+        return names, table
+    
+    @classmethod
+    def sample_loadout(cls, excel_path, sheet_name, selection_mode, weight_column, seed):
+        """
+        Draws a loadout in one of the weighted modes without re-reading the workbook.
+
+        Seeded state is kept once per (workbook, sheet, weight column) and restarts
+        when the seed or the sheet changes, so old seeds and snapshots are not kept alive.
+        """
+        full_excel_path = get_excel_full_path_or_raise(".", excel_path)
+        sheet = load_snapshot(full_excel_path)[sheet_name]
+        key = (full_excel_path, sheet_name, weight_column)
+        
+        if selection_mode == "Shuffle (No Replacement)":
+            # Walk a cached weighted permutation; reshuffle with a new, seed-derived order when exhausted
+            state = cls._permutations.get(key)
+            if state is None or state[0] is not sheet or state[1] != seed:
+                state = [sheet, seed, None, 0, 0]
+                cls._permutations[key] = state
+            if state[2] is None or state[3] >= len(state[2]):
+                names, weights = weighted_entries(sheet, weight_column)
+                rng = random.Random(f"{seed}:{state[4]}")
+                # Efraimidis-Spirakis keys: sorting by u ** (1 / w) gives a weighted random order
+                keyed = [(rng.random() ** (1.0 / weight), name) for name, weight in zip(names, weights) if weight > 0]
+                if not keyed:
+                    raise ValueError(f"All weights in column '{weight_column}' are zero or empty.")
+                state[2] = [name for _, name in sorted(keyed, reverse=True)]
+                state[3] = 0
+                state[4] += 1
+            auto_loadout = state[2][state[3]]
+            state[3] += 1
+            return auto_loadout
+        
+        names, table = cls.get_sampler(full_excel_path, sheet, weight_column)
+        if selection_mode == "Weighted (Seeded)":
+            cached = cls._seeded_rngs.get(key)
+            if cached is None or cached[0] is not sheet or cached[1] != seed:
+                cached = (sheet, seed, random.Random(seed))
+                cls._seeded_rngs[key] = cached
+            rng = cached[2]
+        else:
+            rng = random
+        return names[table.draw(rng)]
+    
+    def get_selected_loadout(self, excel_path, sheet_name, Loadout, selection_mode, weight_column="", sample_seed=0):
         """Returns the selected Loadout value from Column A and an auto-selected loadout based on mode."""
         # Get all data in one call to avoid multiple file reads
         options, _, non_empty_options = self.get_excel_data(excel_path, sheet_name)
@@ -193,6 +329,9 @@ class exLoadoutSelector:
                 auto_loadout = non_empty_options[-(self.__class__._current_index % len(non_empty_options)) - 1]
                 print(f"Decrement selection from {non_empty_options}: {auto_loadout} (index: {self.__class__._current_index})")
                 self.__class__._current_index += 1
+            elif selection_mode in ("Weighted", "Weighted (Seeded)", "Shuffle (No Replacement)"):
+                auto_loadout = self.sample_loadout(excel_path, sheet_name, selection_mode, weight_column, sample_seed)
+                print(f"{selection_mode} selection: {auto_loadout}")
             else:
                 # Fallback to random if mode is unrecognized
                 auto_loadout = random.choice(non_empty_options)
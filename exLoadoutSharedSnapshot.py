@@ -0,0 +1,332 @@
+import datetime
+import mmap
+import os
+import struct
+import threading
+from array import array
+from .exLoadoutSnapshot import RowView, compile_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent writers produce identical files and the last replace wins
+    fcntl = None
+
+# File layout (every section 4-byte aligned):
+#   header | value records | sheet records | code columns + key tables | string blob | blob offset
+# Value records point into the blob; code columns and key tables are native uint32
+# arrays that readers view in place through memoryview.cast, without copying.
+# Snapshot files are host-local caches, so native byte order is fine.
+MAGIC = b"EXLSNAP1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQqqII")    # magic, version, data_only, generation, src mtime, src size, values, sheets
+VALUE_RECORD = struct.Struct("<BxxxII")  # type tag, blob offset, blob length
+SHEET_RECORD = struct.Struct("<IIIIIQQ")  # name offset, name length, max_row, max_column, keys, codes offset, keys offset
+GENERATION = struct.Struct("<8sQqq")    # magic, generation, src mtime, src size
+
+TAG_NONE, TAG_STR, TAG_INT, TAG_FLOAT, TAG_BOOL, TAG_DATETIME, TAG_DATE, TAG_TIME, TAG_TIMEDELTA = range(9)
+
+def _encode_value(value):
+    """Returns the (tag, utf-8 payload) pair stored for a cell value."""
+    if value is None:
+        return TAG_NONE, b""
+    if isinstance(value, bool):
+        return TAG_BOOL, b"1" if value else b"0"
+    if isinstance(value, int):
+        return TAG_INT, str(value).encode()
+    if isinstance(value, float):
+        return TAG_FLOAT, repr(value).encode()
+    if isinstance(value, datetime.datetime):
+        return TAG_DATETIME, value.isoformat().encode()
+    if isinstance(value, datetime.date):
+        return TAG_DATE, value.isoformat().encode()
+    if isinstance(value, datetime.time):
+        return TAG_TIME, value.isoformat().encode()
+    if isinstance(value, datetime.timedelta):
+        return TAG_TIMEDELTA, repr(value.total_seconds()).encode()
+    return TAG_STR, str(value).encode("utf-8")
+
+def _decode_value(tag, payload):
+    if tag == TAG_STR:
+        return str(payload, "utf-8")
+    if tag == TAG_INT:
+        return int(payload)
+    if tag == TAG_FLOAT:
+        return float(payload)
+    if tag == TAG_BOOL:
+        return payload == b"1"
+    if tag == TAG_DATETIME:
+        return datetime.datetime.fromisoformat(str(payload, "ascii"))
+    if tag == TAG_DATE:
+        return datetime.date.fromisoformat(str(payload, "ascii"))
+    if tag == TAG_TIME:
+        return datetime.time.fromisoformat(str(payload, "ascii"))
+    if tag == TAG_TIMEDELTA:
+        return datetime.timedelta(seconds=float(payload))
+    return None
+
+def _align(size):
+    return (size + 3) & ~3
+
+def write_shared_snapshot(snapshot, out_path, generation):
+    """
+    Serializes a WorkbookSnapshot into the fixed-layout file read by SharedWorkbookSnapshot.
+
+    Args:
+        snapshot: The compiled WorkbookSnapshot
+        out_path: Destination file, written through a temporary file and os.replace
+        generation: Generation number stored in the header
+    """
+    values = list(snapshot.table.values)
+    string_codes = {value: code for code, value in enumerate(values) if type(value) is str}
+
+    def string_code(text):
+        code = string_codes.get(text)
+        if code is None:
+            code = len(values)
+            values.append(text)
+            string_codes[text] = code
+        return code
+
+    # Column A key tables: (stripped key code, first row) pairs sorted by key text
+    sheets = []
+    for sheet in snapshot.sheets.values():
+        first_rows = {}
+        for row_idx, value in enumerate(sheet.column_values(1), start=1):
+            if value is not None:
+                first_rows.setdefault(str(value).strip(), row_idx)
+        keys = array("I")
+        for key in sorted(first_rows):
+            keys.append(string_code(key))
+            keys.append(first_rows[key])
+        sheets.append((sheet, keys, string_code(sheet.title)))
+
+    blob = bytearray()
+    value_records = bytearray()
+    for value in values:
+        tag, payload = _encode_value(value)
+        value_records += VALUE_RECORD.pack(tag, len(blob), len(payload))
+        blob += payload
+
+    offset = HEADER.size + len(value_records) + SHEET_RECORD.size * len(sheets)
+    sheet_records = bytearray()
+    body = bytearray()
+    for sheet, keys, title_code in sheets:
+        _, name_offset, name_length = VALUE_RECORD.unpack_from(value_records, title_code * VALUE_RECORD.size)
+        codes_offset = offset + len(body)
+        for column in range(1, sheet.max_column + 1):
+            body += array("I", sheet._columns[column - 1]).tobytes()
+        keys_offset = offset + len(body)
+        body += keys.tobytes()
+        sheet_records += SHEET_RECORD.pack(name_offset, name_length, sheet.max_row, sheet.max_column,
+                                           len(keys) // 2, codes_offset, keys_offset)
+
+    blob_offset = _align(offset + len(body))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, int(snapshot.data_only), generation,
+                         snapshot.mtime_ns, snapshot.size, len(values), len(sheets))
+
+    temp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(value_records)
+        f.write(sheet_records)
+        f.write(body)
+        f.write(b"\0" * (blob_offset - offset - len(body)))
+        f.write(blob)
+        f.write(struct.pack("<Q", blob_offset))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, out_path)
+
+class SharedSheet:
+    """Read-only sheet backed by a memory-mapped snapshot file. Mirrors SheetSnapshot."""
+    __slots__ = ("title", "max_row", "max_column", "_owner", "_codes", "_keys")
+
+    def __init__(self, owner, title, max_row, max_column, codes, keys):
+        self._owner = owner
+        self.title = title
+        self.max_row = max_row
+        self.max_column = max_column
+        self._codes = codes
+        self._keys = keys
+
+    def value(self, row, column):
+        """Returns the cell value at (row, column), or None if empty or out of range."""
+        if row < 1 or column < 1 or row > self.max_row or column > self.max_column:
+            return None
+        return self._owner.decode(self._codes[(column - 1) * self.max_row + row - 1])
+
+    def row(self, row_number):
+        return RowView(self, row_number)
+
+    def column_values(self, column, min_row=1):
+        """Returns the values of a column from min_row to max_row, including empty cells as None."""
+        return [self.value(row, column) for row in range(min_row, self.max_row + 1)]
+
+    def find_row(self, key):
+        """Returns the first row whose stripped Column A value equals key, or None."""
+        keys = self._keys
+        low, high = 0, len(keys) // 2
+        while low < high:
+            mid = (low + high) // 2
+            mid_key = self._owner.decode(keys[2 * mid])
+            if mid_key < key:
+                low = mid + 1
+            elif mid_key > key:
+                high = mid
+            else:
+                return keys[2 * mid + 1]
+        return None
+
+class SharedWorkbookSnapshot:
+    """
+    Workbook snapshot read in place from a memory-mapped file.
+
+    Every process maps the same file read-only, so the loadout data lives once
+    in the OS page cache no matter how many workers read it.
+    """
+
+    def __init__(self, path, snapshot_path):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        with open(snapshot_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+
+        (magic, version, data_only, self.generation, self.mtime_ns, self.size,
+         value_count, sheet_count) = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot file: {snapshot_path}")
+        self.data_only = bool(data_only)
+
+        self._records_offset = HEADER.size
+        self._value_count = value_count
+        self._blob_offset = struct.unpack_from("<Q", view, len(view) - 8)[0]
+
+        self.sheets = {}
+        sheets_offset = HEADER.size + value_count * VALUE_RECORD.size
+        for index in range(sheet_count):
+            (name_offset, name_length, max_row, max_column, key_count,
+             codes_offset, keys_offset) = SHEET_RECORD.unpack_from(view, sheets_offset + index * SHEET_RECORD.size)
+            start = self._blob_offset + name_offset
+            title = str(view[start:start + name_length], "utf-8")
+            codes = view[codes_offset:codes_offset + 4 * max_row * max_column].cast("I")
+            keys = view[keys_offset:keys_offset + 8 * key_count].cast("I")
+            self.sheets[title] = SharedSheet(self, title, max_row, max_column, codes, keys)
+
+    def decode(self, code):
+        """Decodes the value with the given code straight from the mapped blob."""
+        if code == 0:
+            return None
+        tag, offset, length = VALUE_RECORD.unpack_from(self._map, self._records_offset + code * VALUE_RECORD.size)
+        start = self._blob_offset + offset
+        return _decode_value(tag, self._map[start:start + length])
+
+    @property
+    def sheetnames(self):
+        return list(self.sheets)
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self.sheets
+
+    def __getitem__(self, sheet_name):
+        return self.sheets[sheet_name]
+
+    def memory_usage(self):
+        """Reports the mapped size; the pages are shared between processes, not copied."""
+        return {
+            "sheets": len(self.sheets),
+            "distinct_values": self._value_count - 1,
+            "mapped_bytes": len(self._map),
+            "generation": self.generation,
+        }
+
+def _snapshot_base(full_path, data_only):
+    return f"{full_path}.values" if data_only else full_path
+
+def _read_generation(generation_path):
+    """Returns (generation, source mtime_ns, source size) from the generation file, or None."""
+    try:
+        with open(generation_path, "rb") as f:
+            data = f.read(GENERATION.size)
+    except OSError:
+        return None
+    if len(data) != GENERATION.size:
+        return None
+    magic, generation, mtime_ns, size = GENERATION.unpack(data)
+    if magic != MAGIC:
+        return None
+    return generation, mtime_ns, size
+
+def _publish(full_path, data_only, stat):
+    """Compiles the workbook, writes the next generation file and points the generation file at it."""
+    base = _snapshot_base(full_path, data_only)
+    generation_path = f"{base}.exlsnap.gen"
+    lock_file = open(f"{base}.exlsnap.lock", "a+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+        # Another worker may have published while we waited for the lock
+        current = _read_generation(generation_path)
+        if current is not None and current[1:] == (stat.st_mtime_ns, stat.st_size):
+            return current[0]
+
+        previous = current[0] if current is not None else 0
+        generation = previous + 1
+        snapshot = compile_snapshot(full_path, data_only)
+        write_shared_snapshot(snapshot, f"{base}.{generation}.exlsnap", generation)
+
+        temp_path = f"{generation_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(GENERATION.pack(MAGIC, generation, snapshot.mtime_ns, snapshot.size))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, generation_path)
+
+        # Older generations stay valid for processes that still map them; remove what we can
+        if previous:
+            try:
+                os.remove(f"{base}.{previous}.exlsnap")
+            except OSError:
+                pass
+        return generation
+    finally:
+        lock_file.close()
+
+_mapped = {}
+_mapped_lock = threading.Lock()
+
+def load_shared_snapshot(full_path, data_only=False):
+    """
+    Returns the memory-mapped snapshot of a workbook, publishing a new generation if it is stale.
+
+    Args:
+        full_path: Absolute path of an already validated .xlsx file
+        data_only: Read cached formula results instead of formulas
+
+    Returns:
+        SharedWorkbookSnapshot: A read-only mapping of the current generation
+    """
+    stat = os.stat(full_path)
+    base = _snapshot_base(full_path, data_only)
+    key = (full_path, data_only)
+    with _mapped_lock:
+        current = _read_generation(f"{base}.exlsnap.gen")
+        if current is None or current[1:] != (stat.st_mtime_ns, stat.st_size):
+            generation = _publish(full_path, data_only, stat)
+        else:
+            generation = current[0]
+
+        mapped = _mapped.get(key)
+        if mapped is not None and mapped.generation == generation:
+            return mapped
+        try:
+            mapped = SharedWorkbookSnapshot(full_path, f"{base}.{generation}.exlsnap")
+        except FileNotFoundError:
+            # A newer generation replaced this one between reading the counter and mapping it
+            current = _read_generation(f"{base}.exlsnap.gen")
+            if current is None:
+                raise
+            mapped = SharedWorkbookSnapshot(full_path, f"{base}.{current[0]}.exlsnap")
+        _mapped[key] = mapped
+        return mapped
@@ -0,0 +1,292 @@
+import openpyxl
+import os
+import sys
+import threading
+from array import array
+
+# Set EXLOADOUT_SHARED_SNAPSHOT=1 to share one memory-mapped snapshot between ComfyUI processes
+SHARED_SNAPSHOTS = os.environ.get("EXLOADOUT_SHARED_SNAPSHOT", "").lower() in ("1", "true", "yes")
+
+# Code 0 is reserved for empty cells so a fresh column can be zero-filled
+EMPTY_CODE = 0
+
+class InternTable:
+    """
+    Table of distinct cell values shared by every sheet of a workbook snapshot.
+
+    Each distinct value is stored once and referenced by an integer code, so a
+    checkpoint or sampler name that appears in thousands of rows costs one
+    Python object plus a few bytes per cell.
+    """
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values = [None]
+        self._codes = {}
+
+    def code_for(self, value):
+        if value is None:
+            return EMPTY_CODE
+        # Key on the type as well so 1, 1.0 and True keep their own codes
+        key = (type(value), value)
+        code = self._codes.get(key)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[key] = code
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+    def freeze(self):
+        """Drops the lookup dict once every sheet is built; only the value list is needed for reads."""
+        self._codes = None
+
+class RowView:
+    """Lightweight view of a single snapshot row. Columns are 1-based like openpyxl."""
+    __slots__ = ("_sheet", "row_number")
+
+    def __init__(self, sheet, row_number):
+        self._sheet = sheet
+        self.row_number = row_number
+
+    def __getitem__(self, column):
+        return self._sheet.value(self.row_number, column)
+
+    def __len__(self):
+        return self._sheet.max_column
+
+    def values(self, first_column=1, last_column=None):
+        """Returns the values from first_column to last_column (inclusive)."""
+        if last_column is None:
+            last_column = self._sheet.max_column
+        return [self._sheet.value(self.row_number, col) for col in range(first_column, last_column + 1)]
+
+class SheetSnapshot:
+    """
+    Columnar, read-only copy of a worksheet.
+
+    Every column is an array of integer codes into the workbook's InternTable,
+    so memory scales with rows x columns x 2-4 bytes instead of one Python
+    object per cell.
+    """
+    __slots__ = ("title", "max_row", "max_column", "_columns", "_values", "_key_index")
+
+    def __init__(self, title, max_row, max_column, columns, values):
+        self.title = title
+        self.max_row = max_row
+        self.max_column = max_column
+        self._columns = columns
+        self._values = values
+        self._key_index = None
+
+    def value(self, row, column):
+        """Returns the cell value at (row, column), or None if empty or out of range."""
+        if row < 1 or column < 1 or column > len(self._columns):
+            return None
+        codes = self._columns[column - 1]
+        if row > len(codes):
+            return None
+        return self._values[codes[row - 1]]
+
+    def row(self, row_number):
+        return RowView(self, row_number)
+
+    def column_values(self, column, min_row=1):
+        """Returns the values of a column from min_row to max_row, including empty cells as None."""
+        if column < 1 or column > len(self._columns):
+            return [None] * max(0, self.max_row - min_row + 1)
+        values = self._values
+        return [values[code] for code in self._columns[column - 1][min_row - 1:]]
+
+    def find_row(self, key):
+        """Returns the first row whose stripped Column A value equals key, or None."""
+        if self._key_index is None:
+            index = {}
+            for row_idx, value in enumerate(self.column_values(1), start=1):
+                if value is not None:
+                    index.setdefault(str(value).strip(), row_idx)
+            self._key_index = index
+        return self._key_index.get(key)
+
+    def memory_usage(self):
+        """Returns the approximate number of bytes held by the code columns."""
+        return sum(sys.getsizeof(codes) for codes in self._columns) + sys.getsizeof(self._columns)
+
+class WorkbookSnapshot:
+    """Read-only snapshot of every sheet in a workbook, sharing a single InternTable."""
+
+    def __init__(self, path, data_only, mtime_ns, size, sheets, table):
+        self.path = path
+        self.data_only = data_only
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sheets = sheets
+        self.table = table
+
+    @property
+    def sheetnames(self):
+        return list(self.sheets)
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self.sheets
+
+    def __getitem__(self, sheet_name):
+        return self.sheets[sheet_name]
+
+    def memory_usage(self):
+        """
+        Reports the approximate memory held by the snapshot.
+
+        Returns:
+            dict: Byte counts for the code columns, the value table and the total
+        """
+        columns = sum(sheet.memory_usage() for sheet in self.sheets.values())
+        values = sys.getsizeof(self.table.values) + sum(
+            sys.getsizeof(value) for value in self.table.values[1:]
+        )
+        return {
+            "sheets": len(self.sheets),
+            "distinct_values": len(self.table) - 1,
+            "column_bytes": columns,
+            "value_bytes": values,
+            "total_bytes": columns + values,
+        }
+
+def build_sheet(title, rows, table):
+    """
+    Builds a SheetSnapshot from an iterable of row tuples.
+
+    Args:
+        title: The sheet name
+        rows: Iterable of row value sequences (None for empty cells)
+        table: The InternTable shared by the workbook
+
+    Returns:
+        SheetSnapshot: The compiled sheet
+    """
+    columns = []
+    max_row = 0
+    for row in rows:
+        max_row += 1
+        while len(columns) < len(row):
+            # Pad new columns with empty codes for the rows already seen
+            columns.append(array("I", bytes(4 * (max_row - 1))))
+        for col_idx, codes in enumerate(columns):
+            codes.append(table.code_for(row[col_idx]) if col_idx < len(row) else EMPTY_CODE)
+
+    # Narrow the code width when the value table is small enough
+    if len(table) <= 0xFFFF:
+        columns = [array("H", codes) for codes in columns]
+    return SheetSnapshot(title, max_row, len(columns), columns, table.values)
+
+def compile_snapshot(full_path, data_only=False):
+    """Parses the workbook at full_path into a WorkbookSnapshot."""
+    stat = os.stat(full_path)
+    table = InternTable()
+    sheets = {}
+    workbook = openpyxl.load_workbook(full_path, read_only=True, data_only=data_only)
+    try:
+        for sheet in workbook.worksheets:
+            sheets[sheet.title] = build_sheet(sheet.title, sheet.iter_rows(values_only=True), table)
+    finally:
+        workbook.close()
+    table.freeze()
+    return WorkbookSnapshot(full_path, data_only, stat.st_mtime_ns, stat.st_size, sheets, table)
+
+_snapshot_cache = {}
+_snapshot_lock = threading.Lock()
+
+def load_snapshot(full_path, data_only=False, with_journal=True):
+    """
+    Returns a cached snapshot of the workbook, re-parsing it only when the file changes.
+
+    Args:
+        full_path: Absolute path of an already validated .xlsx file
+        data_only: Read cached formula results instead of formulas
+        with_journal: Apply edits still pending in the workbook's edit journal
+
+    Returns:
+        WorkbookSnapshot: The snapshot for the current version of the file
+    """
+    if SHARED_SNAPSHOTS:
+        from .exLoadoutSharedSnapshot import load_shared_snapshot
+        snapshot = load_shared_snapshot(full_path, data_only)
+    else:
+        snapshot = _load_local_snapshot(full_path, data_only)
+
+    if with_journal:
+        from .exLoadoutJournal import overlay_journal
+        snapshot = overlay_journal(snapshot)
+    return snapshot
+
+def _load_local_snapshot(full_path, data_only):
+    stat = os.stat(full_path)
+    key = (full_path, data_only)
+    with _snapshot_lock:
+        snapshot = _snapshot_cache.get(key)
+        if snapshot is not None and snapshot.mtime_ns == stat.st_mtime_ns and snapshot.size == stat.st_size:
+            return snapshot
+        snapshot = compile_snapshot(full_path, data_only)
+        _snapshot_cache[key] = snapshot
+        return snapshot
+
+def invalidate_snapshot(full_path):
+    """Drops any cached snapshot of full_path, e.g. after the workbook was saved."""
+    with _snapshot_lock:
+        for key in [key for key in _snapshot_cache if key[0] == full_path]:
+            del _snapshot_cache[key]
+
+def benchmark_memory(rows=100000, columns=12):
+    """
+    Compares the memory of a snapshot against plain lists of parsed cell values.
+
+    Uses a synthetic sheet whose values repeat the way loadout sheets do
+    (a handful of checkpoint, sampler and CFG values reused across rows).
+
+    Returns:
+        dict: Bytes used by the naive representation and by the snapshot
+    """
+    import tracemalloc
+
+    checkpoints = [f"model_{i:02d}.safetensors" for i in range(40)]
+    samplers = ["euler", "euler_ancestral", "dpmpp_2m", "dpmpp_sde", "uni_pc"]
+
+    def synthetic_rows():
+        for row_idx in range(rows):
+            row = [f"Loadout {row_idx}", checkpoints[row_idx % len(checkpoints)],
+                   samplers[row_idx % len(samplers)], 1.0 + (row_idx % 8) * 0.5, 20 + row_idx % 4]
+            # Copy strings so each cell is its own object, as a parser would produce
+            row = ["".join(value) if isinstance(value, str) else value for value in row]
+            row.extend([None] * (columns - len(row)))
+            yield tuple(row)
+
+    tracemalloc.start()
+    naive = [list(row) for row in synthetic_rows()]
+    naive_bytes = tracemalloc.get_traced_memory()[0]
+    del naive
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = InternTable()
+    sheet = build_sheet("BENCH", synthetic_rows(), table)
+    table.freeze()
+    snapshot_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {
+        "rows": sheet.max_row,
+        "columns": sheet.max_column,
+        "naive_bytes": naive_bytes,
+        "snapshot_bytes": snapshot_bytes,
+        "ratio": naive_bytes / snapshot_bytes if snapshot_bytes else 0.0,
+    }
+
+if __name__ == "__main__":
+    result = benchmark_memory()
+    print(f"{result['rows']} rows x {result['columns']} columns")
+    print(f"Naive lists: {result['naive_bytes'] / 1e6:.1f} MB")
+    print(f"Snapshot:    {result['snapshot_bytes'] / 1e6:.1f} MB ({result['ratio']:.1f}x smaller)")
@@ -0,0 +1,242 @@
+import argparse
+import os
+import sys
+
+try:
+    from .exLoadoutSnapshot import compile_snapshot, load_snapshot
+    from .exLoadoutModelIndex import get_filename_set
+    from .exLoadoutModelInfo import get_model_info
+except ImportError:  # Running as a standalone script
+    from exLoadoutSnapshot import compile_snapshot, load_snapshot
+    from exLoadoutModelIndex import get_filename_set
+    from exLoadoutModelInfo import get_model_info
+
+def get_excel_full_path_or_raise(base_folder, file_path):
+    """
+    Securely resolve Excel file paths within a designated directory.
+
+    Args:
+        base_folder: The base folder name (use "." for current directory)
+        file_path: The requested file path
+
+    Returns:
+        str: The absolute path if valid
+
+    Raises:
+        ValueError: If the path is invalid or outside the allowed directory
+    """
+    # Get the directory where the script is located
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # If base_folder is ".", use the current directory, otherwise create subdirectory path
+    if base_folder == ".":
+        base_dir = current_dir
+    else:
+        base_dir = os.path.join(current_dir, base_folder)
+
+    # Normalize the file path to prevent directory traversal
+    normalized_file_path = os.path.normpath(file_path)
+
+    # Check for directory traversal attempts
+    if os.path.isabs(normalized_file_path) or normalized_file_path.startswith('..'):
+        raise ValueError("Invalid file path. Absolute paths and parent directory references are not allowed.")
+
+    # Construct the full path
+    full_path = os.path.join(base_dir, normalized_file_path)
+
+    # Resolve any remaining relative components
+    resolved_path = os.path.abspath(full_path)
+
+    # Ensure the resolved path is still within the base directory
+    if not resolved_path.startswith(os.path.abspath(base_dir)):
+        raise ValueError("Invalid file path. Path must be within the designated directory.")
+
+    return resolved_path
+
+# Column index (1-based) -> (ComfyUI model folder, label) checked by the validator
+MODEL_COLUMNS = {
+    2: ("checkpoints", "checkpoint"),
+    3: ("text_encoders", "CLIP"),
+    4: ("vae", "VAE"),
+}
+
+def validate_sheet(sheet, filename_sets):
+    """
+    Checks every loadout row of a sheet in one pass.
+
+    Args:
+        sheet: A snapshot sheet (SheetSnapshot or SharedSheet)
+        filename_sets: Mapping of model folder name to a set of known filenames
+
+    Returns:
+        list: Human readable issue strings, empty if the sheet is valid
+    """
+    issues = []
+    first_rows = {}
+    for row_idx in range(2, sheet.max_row + 1):  # Row 1 is the header
+        row = sheet.row(row_idx)
+        name = row[1]
+        name = "" if name is None else str(name).strip()
+        model_values = {column: row[column] for column in MODEL_COLUMNS}
+
+        if not name:
+            if any(value not in (None, "") for value in row.values(2)):
+                issues.append(f"Row {row_idx}: has values but no loadout name in Column A.")
+            continue
+
+        if name in first_rows:
+            issues.append(f"Row {row_idx}: duplicate loadout '{name}' (first defined in row {first_rows[name]}).")
+        else:
+            first_rows[name] = row_idx
+
+        if not model_values[2]:
+            issues.append(f"Row {row_idx}: loadout '{name}' has no checkpoint in Column B.")
+
+        for column, (folder_name, label) in MODEL_COLUMNS.items():
+            value = model_values[column]
+            if not value:
+                continue
+            filename = str(value).strip()
+            if filename not in filename_sets[folder_name]:
+                column_letter = chr(ord("A") + column - 1)
+                issues.append(f"Row {row_idx}: loadout '{name}' references unknown {label} '{filename}' in Column {column_letter}.")
+    return issues
+
+def describe_models(sheet, filename_sets):
+    """
+    Reads the safetensors header of every model a sheet references, once per file.
+
+    Args:
+        sheet: A snapshot sheet (SheetSnapshot or SharedSheet)
+        filename_sets: Mapping of model folder name to a set of known filenames
+
+    Returns:
+        tuple: (one summary line per loadout, issues for files that are not what their column expects)
+    """
+    import folder_paths
+
+    lines, issues = [], []
+    infos = {}
+    for row_idx in range(2, sheet.max_row + 1):
+        row = sheet.row(row_idx)
+        name = "" if row[1] is None else str(row[1]).strip()
+        if not name:
+            continue
+
+        parts = []
+        total_bytes = 0
+        for column, (folder_name, label) in MODEL_COLUMNS.items():
+            filename = str(row[column]).strip() if row[column] else ""
+            if filename not in filename_sets[folder_name]:
+                continue  # Missing files are already reported by validate_sheet
+            if (folder_name, filename) not in infos:
+                path = folder_paths.get_full_path(folder_name, filename)
+                infos[(folder_name, filename)] = get_model_info(path) if path else None
+            info = infos[(folder_name, filename)]
+            if info is None:
+                continue
+            parts.append(f"{label} {info.summary()}")
+            total_bytes += info.total_bytes
+            if column == 2 and not info.is_checkpoint:
+                issues.append(f"Row {row_idx}: loadout '{name}' has a {info.family} file '{filename}' in Column B, not a checkpoint.")
+
+        if parts:
+            lines.append(f"Row {row_idx} '{name}': {'; '.join(parts)} (reads {total_bytes / 1024 ** 3:.2f} GB)")
+    return lines, issues
+
+def format_report(sheet_name, issues, model_lines=None):
+    if not issues:
+        lines = [f"Sheet '{sheet_name}': all loadouts are valid."]
+    else:
+        lines = [f"Sheet '{sheet_name}': {len(issues)} issue(s) found."]
+        lines.extend(issues)
+    if model_lines:
+        lines.append("Models:")
+        lines.extend(model_lines)
+    return "\n".join(lines)
+
+class exLoadoutValidate:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "excel_path": ("STRING", {"default": "exLoadoutList.xlsx"}),
+                "sheet_name": ("STRING", {"default": "MODELS"}),
+            },
+            "optional": {
+                "model_info": ("BOOLEAN", {"default": False}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("report", "issue_count")
+    FUNCTION = "validate_loadouts"
+    CATEGORY = "exLoadout"
+    DESCRIPTION = (
+        "Checks every loadout row of a sheet before loading anything: unknown checkpoint (Column B), "
+        "CLIP (Column C) or VAE (Column D) files, rows without a name or checkpoint, and duplicate names in Column A. "
+        "With model_info on, the safetensors headers are read to add each model's family, size and dtype to the report."
+    )
+
+    def validate_loadouts(self, excel_path, sheet_name, model_info=False):
+        # Secure path resolution for Excel file - look in current directory
+        full_excel_path = get_excel_full_path_or_raise(".", excel_path)
+
+        # Validate file extension
+        if not full_excel_path.lower().endswith(".xlsx"):
+            raise ValueError("Invalid file type. Only .xlsx files are supported.")
+
+        # Check if file exists
+        if not os.path.exists(full_excel_path):
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            raise FileNotFoundError(f"Excel file not found: {os.path.basename(full_excel_path)}\n"
+                                  f"Expected location: {full_excel_path}\n"
+                                  f"Make sure the file exists in: {base_dir}")
+
+        workbook = load_snapshot(full_excel_path)
+        if sheet_name not in workbook:
+            raise ValueError(f"Sheet '{sheet_name}' not found in the Excel file")
+
+        filename_sets = {folder_name: get_filename_set(folder_name) for folder_name, _ in MODEL_COLUMNS.values()}
+        issues = validate_sheet(workbook[sheet_name], filename_sets)
+        model_lines = None
+        if model_info:
+            model_lines, model_issues = describe_models(workbook[sheet_name], filename_sets)
+            issues.extend(model_issues)
+        return (format_report(sheet_name, issues, model_lines), len(issues))
+
+def main(argv=None):
+    """Command line entry point: python exLoadoutValidate.py [--comfyui-root DIR] [excel_path] [--sheet NAME ...] [--model-info]"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Validate exLoadout sheets against the models installed in ComfyUI.")
+    parser.add_argument("excel_path", nargs="?", default=os.path.join(package_dir, "exLoadoutList.xlsx"))
+    parser.add_argument("--sheet", action="append", dest="sheets",
+                        help="Sheet to validate (repeatable, defaults to MODELS)")
+    parser.add_argument("--comfyui-root", default=os.path.dirname(os.path.dirname(package_dir)),
+                        help="ComfyUI installation used to resolve model folders")
+    parser.add_argument("--model-info", action="store_true",
+                        help="Read safetensors headers and report each model's family, size and dtype")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.abspath(args.comfyui_root))
+    workbook = compile_snapshot(os.path.abspath(args.excel_path))
+    sheet_names = args.sheets or ["MODELS"]
+    filename_sets = {folder_name: get_filename_set(folder_name) for folder_name, _ in MODEL_COLUMNS.values()}
+
+    total = 0
+    for sheet_name in sheet_names:
+        if sheet_name not in workbook:
+            print(f"Sheet '{sheet_name}' not found in the Excel file")
+            total += 1
+            continue
+        issues = validate_sheet(workbook[sheet_name], filename_sets)
+        model_lines = None
+        if args.model_info:
+            model_lines, model_issues = describe_models(workbook[sheet_name], filename_sets)
+            issues.extend(model_issues)
+        print(format_report(sheet_name, issues, model_lines))
+        total += len(issues)
+    return 1 if total else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
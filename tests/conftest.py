@@ -0,0 +1,204 @@
+import atexit
+import glob
+import importlib.util
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import types
+import uuid
+
+import openpyxl
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = tempfile.mkdtemp(prefix="exloadout-models-")
+atexit.register(shutil.rmtree, MODELS_DIR, ignore_errors=True)
+
+# Keep the background journal compactor from racing the tests; they compact explicitly
+os.environ.setdefault("EXLOADOUT_JOURNAL_MAX_AGE", "3600")
+os.environ.setdefault("EXLOADOUT_JOURNAL_MAX_RECORDS", "100000")
+
+DTYPE_SIZES = {"F32": 4, "F16": 2, "BF16": 2, "F8_E4M3": 1}
+
+def write_safetensors(path, tensors, metadata=None):
+    """Writes a synthetic .safetensors file: a real header, zero-filled data. tensors: name -> (dtype, shape)."""
+    header = {}
+    offset = 0
+    for name, (dtype, shape) in tensors.items():
+        size = DTYPE_SIZES[dtype]
+        for dim in shape:
+            size *= dim
+        header[name] = {"dtype": dtype, "shape": shape, "data_offsets": [offset, offset + size]}
+        offset += size
+    if metadata is not None:
+        header["__metadata__"] = metadata
+    data = json.dumps(header).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(data)))
+        f.write(data)
+        f.truncate(8 + len(data) + offset)
+
+def _install_comfy_stubs():
+    """Stand-ins for the ComfyUI modules the nodes import. comfy.sd records calls and sleeps DELAY seconds per load."""
+    folder_paths = types.ModuleType("folder_paths")
+
+    def get_folder_paths(folder_name):
+        return [os.path.join(MODELS_DIR, folder_name)]
+
+    def get_filename_list(folder_name):
+        base_dir = folder_paths.get_folder_paths(folder_name)[0]
+        filenames = []
+        for root, _, files in os.walk(base_dir):
+            filenames.extend(os.path.relpath(os.path.join(root, name), base_dir) for name in files)
+        return filenames
+
+    def get_full_path(folder_name, filename):
+        path = os.path.join(folder_paths.get_folder_paths(folder_name)[0], filename)
+        return path if os.path.isfile(path) else None
+
+    def get_full_path_or_raise(folder_name, filename):
+        path = get_full_path(folder_name, filename)
+        if path is None:
+            raise FileNotFoundError(f"Model in folder '{folder_name}' with filename '{filename}' not found.")
+        return path
+
+    folder_paths.get_folder_paths = get_folder_paths
+    folder_paths.get_filename_list = get_filename_list
+    folder_paths.get_full_path = get_full_path
+    folder_paths.get_full_path_or_raise = get_full_path_or_raise
+
+    sd = types.ModuleType("comfy.sd")
+    sd.DELAY = 0.0
+    sd.CALLS = []
+
+    def load_checkpoint_guess_config(ckpt_path, output_vae=True, output_clip=True, embedding_directory=None):
+        sd.CALLS.append(("checkpoint", ckpt_path, output_clip, output_vae))
+        time.sleep(sd.DELAY)
+        return (("model", ckpt_path), ("clip", ckpt_path) if output_clip else None,
+                ("vae", ckpt_path) if output_vae else None, None)
+
+    def load_clip(ckpt_paths, embedding_directory=None, clip_type=None):
+        sd.CALLS.append(("clip", ckpt_paths[0]))
+        time.sleep(sd.DELAY)
+        return ("clip", ckpt_paths[0])
+
+    def load_vae(vae_path):
+        sd.CALLS.append(("vae", vae_path))
+        time.sleep(sd.DELAY)
+        if "bad" in os.path.basename(vae_path):
+            raise RuntimeError("corrupt VAE")
+        return ("vae", vae_path)
+
+    def load_lora_for_models(model, clip, lora, strength_model, strength_clip):
+        return model, clip
+
+    sd.load_checkpoint_guess_config = load_checkpoint_guess_config
+    sd.load_clip = load_clip
+    sd.load_vae = load_vae
+    sd.load_lora_for_models = load_lora_for_models
+
+    utils = types.ModuleType("comfy.utils")
+    utils.load_torch_file = lambda path, safe_load=False: {"path": path}
+
+    comfy = types.ModuleType("comfy")
+    comfy.sd = sd
+    comfy.utils = utils
+    sys.modules.update({"folder_paths": folder_paths, "comfy": comfy, "comfy.sd": sd, "comfy.utils": utils})
+
+def _write_models():
+    write_safetensors(os.path.join(MODELS_DIR, "checkpoints", "base.safetensors"), {
+        "model.diffusion_model.input_blocks.0.0.weight": ("F16", [320, 4, 3, 3]),
+        "first_stage_model.decoder.up.0.block.0.conv1.weight": ("F16", [8]),
+        "first_stage_model.encoder.down.0.block.0.conv1.weight": ("F16", [8]),
+        "cond_stage_model.transformer.text_model.encoder.layers.0.mlp.fc1.weight": ("F16", [8]),
+    })
+    write_safetensors(os.path.join(MODELS_DIR, "checkpoints", "other.safetensors"), {
+        "model.diffusion_model.double_blocks.0.img_attn.qkv.weight": ("BF16", [96, 32]),
+        "model.diffusion_model.single_blocks.0.linear1.weight": ("BF16", [96, 32]),
+    })
+    write_safetensors(os.path.join(MODELS_DIR, "text_encoders", "t5.safetensors"), {
+        "encoder.block.0.layer.0.SelfAttention.q.weight": ("F16", [64, 64]),
+        "shared.weight": ("F16", [128, 64]),
+    })
+    write_safetensors(os.path.join(MODELS_DIR, "vae", "ae.safetensors"), {
+        "decoder.up.0.block.0.conv1.weight": ("F32", [8, 8, 3, 3]),
+        "encoder.down.0.block.0.conv1.weight": ("F32", [8, 8, 3, 3]),
+    })
+    write_safetensors(os.path.join(MODELS_DIR, "vae", "bad.safetensors"), {
+        "decoder.up.0.block.0.conv1.weight": ("F32", [8]),
+    })
+
+def _load_package():
+    """Imports the repository as package 'exloadout'; the checkout folder name (ComfyUI-exLoadout) is not importable."""
+    spec = importlib.util.spec_from_file_location(
+        "exloadout", os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["exloadout"] = module
+    spec.loader.exec_module(module)
+
+_install_comfy_stubs()
+_write_models()
+_load_package()
+
+LOADOUT_ROWS = [
+    ("LOADOUT", "MODEL", "CLIP", "VAE"),
+    ("Base", "base.safetensors", None, None),
+    ("BaseVae", "base.safetensors", None, "ae.safetensors"),
+    ("Full", "other.safetensors", "t5.safetensors", "ae.safetensors"),
+    ("BadVae", "base.safetensors", None, "bad.safetensors"),
+]
+
+def create_workbook(path, rows=LOADOUT_ROWS, sheet_name="MODELS"):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = sheet_name
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(path)
+    return path
+
+@pytest.fixture
+def comfy_sd():
+    sd = sys.modules["comfy.sd"]
+    sd.DELAY = 0.0
+    sd.CALLS.clear()
+    yield sd
+    sd.DELAY = 0.0
+
+@pytest.fixture
+def package_workbook():
+    """A throwaway workbook inside the package folder, where the nodes resolve excel_path. Yields (excel_path, full path)."""
+    excel_path = f"_pytest_{uuid.uuid4().hex}.xlsx"
+    full_path = create_workbook(os.path.join(PACKAGE_DIR, excel_path))
+    yield excel_path, full_path
+    for path in glob.glob(full_path + "*"):
+        os.remove(path)
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    return create_workbook(str(tmp_path / "loadouts.xlsx"))
+
+@pytest.fixture
+def model_folder(tmp_path, monkeypatch):
+    """Returns a factory pointing a folder_paths folder (e.g. "loras") at an empty per-test directory."""
+    from exloadout.exLoadoutModelIndex import clear_filename_sets
+
+    folder_paths = sys.modules["folder_paths"]
+    get_folder_paths = folder_paths.get_folder_paths
+    folders = {}
+
+    def point(folder_name):
+        folders[folder_name] = str(tmp_path / folder_name)
+        os.makedirs(folders[folder_name], exist_ok=True)
+        clear_filename_sets()
+        return tmp_path / folder_name
+
+    monkeypatch.setattr(folder_paths, "get_folder_paths",
+                        lambda name: [folders[name]] if name in folders else get_folder_paths(name))
+    yield point
+    clear_filename_sets()
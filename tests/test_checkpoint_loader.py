@@ -0,0 +1,114 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import MODELS_DIR
+from exloadout.exLoadoutCheckpointLoader import _resident, exLoadoutCheckpointLoader, load_vae
+
+@pytest.fixture(autouse=True)
+def empty_resident_cache():
+    _resident.clear()
+    yield
+    _resident.resize(0)
+    _resident.clear()
+
+def run_loader(excel_path, loadout, load_mode="sequential", resident_limit=0):
+    return exLoadoutCheckpointLoader().exLoadoutCheckpointLoader(
+        excel_path, "MODELS", loadout, "stable_diffusion", load_mode=load_mode, resident_limit=resident_limit)
+
+def test_concurrent_loading_overlaps_component_reads(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    comfy_sd.DELAY = 0.2
+
+    start = time.perf_counter()
+    sequential = run_loader(excel_path, "Full", "sequential")
+    sequential_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = run_loader(excel_path, "Full", "concurrent")
+    concurrent_seconds = time.perf_counter() - start
+
+    assert sequential[:3] == concurrent[:3]
+    assert sequential_seconds >= 0.6
+    assert concurrent_seconds < 0.45
+
+def test_concurrent_mode_reports_load_times(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    output = run_loader(excel_path, "Full", "concurrent")[3]
+    assert output.startswith("Loadout: Full, Model: other.safetensors, CLIP: t5.safetensors, VAE: ae.safetensors")
+    assert "Load times: checkpoint" in output and "total" in output
+
+def test_sequential_mode_output_is_unchanged(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    output = run_loader(excel_path, "BaseVae", "sequential")[3]
+    assert output == "Loadout: BaseVae, Model: base.safetensors, CLIP: Default, VAE: ae.safetensors"
+
+@pytest.mark.parametrize("load_mode", ["sequential", "concurrent"])
+def test_failed_override_falls_back_to_checkpoint_vae(package_workbook, comfy_sd, load_mode):
+    excel_path, _ = package_workbook
+    model, clip, vae, output = run_loader(excel_path, "BadVae", load_mode)
+    assert vae[0] == "vae" and vae[1].endswith("base.safetensors")
+    assert "VAE: Default" in output
+
+def test_overrides_skip_the_checkpoint_parts_they_replace(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    run_loader(excel_path, "Full", "concurrent")
+    checkpoint_calls = [call for call in comfy_sd.CALLS if call[0] == "checkpoint"]
+    assert [call[2:] for call in checkpoint_calls] == [(False, False)]
+
+def test_switching_loadouts_reloads_only_what_differs(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    base_vae = run_loader(excel_path, "BaseVae", resident_limit=1)
+    comfy_sd.CALLS.clear()
+
+    # Same checkpoint, but now its own VAE is needed: only the checkpoint is read again
+    base = run_loader(excel_path, "Base", resident_limit=1)
+    assert [call[0] for call in comfy_sd.CALLS] == ["checkpoint"]
+    comfy_sd.CALLS.clear()
+
+    # Back to the VAE override: the checkpoint already holds every part asked for, the VAE is resident
+    again = run_loader(excel_path, "BaseVae", resident_limit=1)
+    assert comfy_sd.CALLS == []
+    assert again[2] is base_vae[2]
+    assert again[0] is base[0]
+
+def test_rows_sharing_a_vae_share_one_object(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    full = run_loader(excel_path, "Full", resident_limit=2)
+    base_vae = run_loader(excel_path, "BaseVae", resident_limit=2)
+    assert full[2] is base_vae[2]
+    assert [call[0] for call in comfy_sd.CALLS].count("vae") == 1
+
+def test_concurrent_requests_for_one_file_load_it_once(comfy_sd):
+    _resident.resize(1)
+    comfy_sd.DELAY = 0.1
+    vae_path = os.path.join(MODELS_DIR, "vae", "ae.safetensors")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: load_vae(vae_path), range(8)))
+    assert all(result is results[0] for result in results)
+    assert comfy_sd.CALLS == [("vae", vae_path)]
+
+def test_resident_limit_zero_keeps_nothing(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    run_loader(excel_path, "BaseVae", resident_limit=0)
+    run_loader(excel_path, "BaseVae", resident_limit=0)
+    assert [call[0] for call in comfy_sd.CALLS] == ["checkpoint", "vae", "checkpoint", "vae"]
+    assert not _resident.entries
+
+def test_reuse_is_off_by_default(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    assert exLoadoutCheckpointLoader.INPUT_TYPES()["optional"]["resident_limit"][1]["default"] == 0
+    node = exLoadoutCheckpointLoader()
+    node.exLoadoutCheckpointLoader(excel_path, "MODELS", "Base", "stable_diffusion")
+    node.exLoadoutCheckpointLoader(excel_path, "MODELS", "Base", "stable_diffusion")
+    assert [call[0] for call in comfy_sd.CALLS] == ["checkpoint", "checkpoint"]
+    assert not _resident.entries
+
+def test_a_limit_of_zero_releases_what_other_nodes_kept(package_workbook, comfy_sd):
+    excel_path, _ = package_workbook
+    run_loader(excel_path, "Full", resident_limit=2)
+    assert _resident.entries
+    run_loader(excel_path, "Base", resident_limit=0)
+    assert not _resident.entries
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+
+import openpyxl
+import pytest
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from exloadout import exLoadoutJournal
+from exloadout.exLoadoutEditCell import apply_cell_edits
+from exloadout.exLoadoutJournal import append_edits, compact_journal, journal_paths, read_records
+from exloadout.exLoadoutSnapshot import load_snapshot
+
+def saved_value(path, coordinate):
+    workbook = openpyxl.load_workbook(path)
+    try:
+        return workbook["MODELS"][coordinate].value
+    finally:
+        workbook.close()
+
+def write_journal(path, records, torn_tail=b""):
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(json.dumps(record).encode("utf-8") + b"\n")
+        f.write(torn_tail)
+
+def record(row, column, value, key=None):
+    # A current timestamp, so the background compactor does not consider the journal overdue
+    entry = {"sheet": "MODELS", "column": column, "value": value, "ts": time.time()}
+    if key is None:
+        entry["row"] = row
+    else:
+        entry["key"] = key
+    return entry
+
+def test_appended_edits_are_overlaid_until_compacted(workbook_path):
+    rows = append_edits(workbook_path, "MODELS", [(2, "C", "t5.safetensors"), ("Full", "E", 3)])
+    assert rows[2].startswith("A2: Base, B2: base.safetensors, C2: t5.safetensors")
+
+    journal_path, _ = journal_paths(workbook_path)
+    assert len(read_records(journal_path)) == 2
+    assert saved_value(workbook_path, "C2") is None
+    assert load_snapshot(workbook_path)["MODELS"].value(2, 3) == "t5.safetensors"
+    assert load_snapshot(workbook_path, with_journal=False)["MODELS"].value(2, 3) is None
+
+    assert compact_journal(workbook_path) == 2
+    assert not any(os.path.exists(path) for path in journal_paths(workbook_path))
+    assert saved_value(workbook_path, "C2") == "t5.safetensors"
+    assert saved_value(workbook_path, "E4") == 3
+    assert load_snapshot(workbook_path)["MODELS"].value(2, 3) == "t5.safetensors"
+
+def test_later_edits_in_a_batch_see_earlier_renames(workbook_path):
+    append_edits(workbook_path, "MODELS", [("Base", "A", "Renamed"), ("Renamed", "B", "other.safetensors")])
+    sheet = load_snapshot(workbook_path)["MODELS"]
+    assert sheet.find_row("Renamed") == 2
+    assert sheet.value(2, 2) == "other.safetensors"
+
+def test_invalid_edits_write_nothing(workbook_path):
+    for edits in ([(2, "B", {"a": 1})], [(2, "B", "bad\x01")], [(99, "B", "x")], [(2, "M", "x")], [("Nope", "B", "x")],
+                  [(2, "B", "ok"), (3, "B", [1])]):
+        with pytest.raises(ValueError):
+            append_edits(workbook_path, "MODELS", edits)
+    journal_path, _ = journal_paths(workbook_path)
+    assert not os.path.exists(journal_path)
+
+def test_crash_during_compaction_is_replayed(workbook_path):
+    journal_path, compacting_path = journal_paths(workbook_path)
+    # A compaction was interrupted after the rename; newer edits went to a fresh journal
+    write_journal(compacting_path, [record(2, "C", "old"), record(3, "E", 1)])
+    write_journal(journal_path, [record(2, "C", "new")])
+
+    sheet = load_snapshot(workbook_path)["MODELS"]
+    assert sheet.value(2, 3) == "new"
+    assert sheet.value(3, 5) == 1
+
+    compact_journal(workbook_path)
+    compact_journal(workbook_path)
+    assert not any(os.path.exists(path) for path in journal_paths(workbook_path))
+    assert saved_value(workbook_path, "C2") == "new"
+    assert saved_value(workbook_path, "E3") == 1
+
+def test_torn_last_record_is_skipped(workbook_path):
+    journal_path, _ = journal_paths(workbook_path)
+    write_journal(journal_path, [record(2, "C", "kept")], torn_tail=b'{"sheet": "MODELS", "row": 2, "col')
+    assert len(read_records(journal_path)) == 1
+    compact_journal(workbook_path)
+    assert saved_value(workbook_path, "C2") == "kept"
+
+def test_unwritable_record_does_not_block_the_workbook(workbook_path):
+    journal_path, compacting_path = journal_paths(workbook_path)
+    write_journal(journal_path, [
+        record(2, "C", {"a": 1}),
+        record(None, "C", "kept", key="BaseVae"),
+        record(2, "M", "x"),
+        {"sheet": "MISSING", "row": 2, "column": "B", "value": "x", "ts": time.time()},
+    ])
+    assert load_snapshot(workbook_path)["MODELS"].value(2, 3) is None
+
+    assert compact_journal(workbook_path) == 1
+    assert not os.path.exists(compacting_path)
+    assert saved_value(workbook_path, "C3") == "kept"
+
+    # Direct edits fold the journal in first; they must keep working
+    apply_cell_edits(workbook_path, "MODELS", [(2, "D", "ae.safetensors")])
+    assert saved_value(workbook_path, "D2") == "ae.safetensors"
+
+def test_direct_edits_fold_in_pending_journal_first(workbook_path):
+    append_edits(workbook_path, "MODELS", [(2, "C", "journaled")])
+    apply_cell_edits(workbook_path, "MODELS", [(2, "C", "direct")])
+    assert not any(os.path.exists(path) for path in journal_paths(workbook_path))
+    assert saved_value(workbook_path, "C2") == "direct"
+
+def test_direct_edits_and_pending_journal_share_one_save(workbook_path, monkeypatch):
+    append_edits(workbook_path, "MODELS", [(3, "C", "journaled")])
+    saves = []
+    write = exLoadoutJournal.write_workbook_edits
+    monkeypatch.setattr(exLoadoutJournal, "write_workbook_edits", lambda path, edits: saves.append(edits) or write(path, edits))
+
+    rows = apply_cell_edits(workbook_path, "MODELS", [(2, "C", "direct")])
+
+    assert list(rows) == [2]
+    assert saves == [{"MODELS": [(3, "C", "journaled"), (2, "C", "direct")]}]
+    assert saved_value(workbook_path, "C3") == "journaled"
+    assert saved_value(workbook_path, "C2") == "direct"
+
+def test_appends_cannot_land_between_folding_and_direct_write(workbook_path, monkeypatch):
+    append_edits(workbook_path, "MODELS", [(2, "C", "journaled")])
+    racers = []
+    write = exLoadoutJournal.write_workbook_edits
+
+    def write_while_an_append_races(path, edits):
+        racer = threading.Thread(target=append_edits, args=(workbook_path, "MODELS", [(2, "C", "appended")]))
+        racer.start()
+        racers.append(racer)
+        racer.join(timeout=0.3)
+        assert racer.is_alive()  # Waiting for the journal lock held by the direct edit
+        return write(path, edits)
+
+    monkeypatch.setattr(exLoadoutJournal, "write_workbook_edits", write_while_an_append_races)
+    apply_cell_edits(workbook_path, "MODELS", [(2, "C", "direct")])
+    monkeypatch.undo()
+    racers[0].join(timeout=5)
+
+    # The append was serialized after the direct edit, so readers and the compacted file agree it is newest
+    assert saved_value(workbook_path, "C2") == "direct"
+    assert load_snapshot(workbook_path)["MODELS"].value(2, 3) == "appended"
+    compact_journal(workbook_path)
+    assert saved_value(workbook_path, "C2") == "appended"
+
+def test_compactor_keeps_watching_a_path_re_added_by_an_append(workbook_path):
+    compactor = exLoadoutJournal.JournalCompactor()  # Not started; driven by hand
+    compactor.paths.add(workbook_path)
+    journal_path, _ = journal_paths(workbook_path)
+
+    with exLoadoutJournal._compactor_lock:
+        checker = threading.Thread(target=compactor.forget_if_done, args=(workbook_path,))
+        checker.start()
+        checker.join(timeout=0.2)
+        assert checker.is_alive()
+        # An append writes its journal while the compactor is about to check
+        write_journal(journal_path, [record(2, "C", "pending")])
+    checker.join(timeout=5)
+    assert workbook_path in compactor.paths
+
+    os.remove(journal_path)
+    compactor.forget_if_done(workbook_path)
+    assert workbook_path not in compactor.paths
+
+@pytest.mark.skipif(fcntl is None, reason="flock is not available")
+def test_appends_wait_for_the_journal_lock(workbook_path):
+    journal_path, _ = journal_paths(workbook_path)
+    # Another worker holds the lock, e.g. while renaming the journal for compaction
+    with open(f"{journal_path}.lock", "a+b") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        writer = threading.Thread(target=append_edits, args=(workbook_path, "MODELS", [(2, "C", "waited")]))
+        writer.start()
+        writer.join(timeout=0.3)
+        assert writer.is_alive()
+        assert not os.path.exists(journal_path)
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert [entry["value"] for entry in read_records(journal_path)] == ["waited"]
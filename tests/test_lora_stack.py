@@ -0,0 +1,117 @@
+import os
+import sys
+
+import pytest
+
+from conftest import create_workbook
+from exloadout.exLoadoutLoraStack import _lora_cache, exLoadoutLoraStack, load_lora_cached, parse_lora_columns
+
+LORA_ROWS = [
+    ("LOADOUT", "MODEL", "CLIP", "VAE", "LORA 1", "STRENGTH 1", "LORA 2", "STRENGTH 2", "LORA 3", "STRENGTH 3"),
+    ("Portrait", "base.safetensors", None, None, "shared.safetensors", 0.8, "portrait.safetensors", None, None, None),
+    ("Style", "base.safetensors", None, None, "shared.safetensors", "", "off.safetensors", 0, "  style.safetensors ", "0.5"),
+    ("Unlisted", "base.safetensors", None, None, "missing.safetensors", 1, None, None, None, None),
+    ("BadStrength", "base.safetensors", None, None, "portrait.safetensors", "strong", None, None, None, None),
+]
+
+@pytest.fixture(autouse=True)
+def empty_lora_cache():
+    _lora_cache.clear()
+    yield
+    _lora_cache.clear()
+
+@pytest.fixture
+def loras(model_folder, monkeypatch):
+    """Per-test LoRA files; records every file read and every LoRA application."""
+    folder = model_folder("loras")
+    for name in ("shared", "portrait", "off", "style", "x", "y", "z"):
+        (folder / f"{name}.safetensors").write_bytes(name.encode())
+
+    reads, applied = [], []
+    comfy = sys.modules["comfy"]
+    monkeypatch.setattr(comfy.utils, "load_torch_file",
+                        lambda path, safe_load=False: reads.append(os.path.basename(path)) or {"path": path})
+    monkeypatch.setattr(comfy.sd, "load_lora_for_models",
+                        lambda model, clip, lora, strength_model, strength_clip:
+                        applied.append((os.path.basename(lora["path"]), strength_model, strength_clip)) or (model, clip))
+    return folder, reads, applied
+
+@pytest.fixture
+def lora_workbook(package_workbook):
+    excel_path, full_path = package_workbook
+    create_workbook(full_path, rows=LORA_ROWS)
+    return excel_path
+
+def apply(excel_path, loadout, cache_size=8):
+    return exLoadoutLoraStack().apply_lora_stack(
+        "model", "clip", excel_path, "MODELS", loadout, "E:F, G:H, I:J", cache_size=cache_size)
+
+def test_shared_lora_is_not_read_again(loras, lora_workbook):
+    _, reads, applied = loras
+    apply(lora_workbook, "Portrait")
+    model, clip, output = apply(lora_workbook, "Style")
+
+    assert reads == ["shared.safetensors", "portrait.safetensors", "style.safetensors"]
+    assert applied == [
+        ("shared.safetensors", 0.8, 0.8), ("portrait.safetensors", 1.0, 1.0),
+        ("shared.safetensors", 1.0, 1.0), ("style.safetensors", 0.5, 0.5),
+    ]
+    assert (model, clip) == ("model", "clip")
+    assert output == "Loadout: Style, LoRAs: shared.safetensors (1), style.safetensors (0.5)"
+
+def test_empty_names_and_zero_strengths_are_skipped(loras, lora_workbook):
+    _, reads, applied = loras
+    apply(lora_workbook, "Style")
+    assert "off.safetensors" not in reads
+    assert [name for name, _, _ in applied] == ["shared.safetensors", "style.safetensors"]
+
+def test_unlisted_lora_and_bad_strength_are_rejected(loras, lora_workbook):
+    with pytest.raises(ValueError, match="not in the allowed loras list"):
+        apply(lora_workbook, "Unlisted")
+    with pytest.raises(ValueError, match="Invalid strength 'strong'"):
+        apply(lora_workbook, "BadStrength")
+
+def test_changed_file_is_read_again(loras):
+    folder, reads, _ = loras
+    path = str(folder / "x.safetensors")
+    load_lora_cached(path, 8)
+    load_lora_cached(path, 8)
+    assert reads == ["x.safetensors"]
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    load_lora_cached(path, 8)
+    assert reads == ["x.safetensors", "x.safetensors"]
+    # Only the current version stays cached
+    assert [key[0] for key in _lora_cache] == [path]
+
+def test_least_recently_used_lora_is_evicted(loras):
+    folder, reads, _ = loras
+    x, y, z = (str(folder / f"{name}.safetensors") for name in "xyz")
+    for path in (x, y, x, z):
+        load_lora_cached(path, 2)
+    assert reads == ["x.safetensors", "y.safetensors", "z.safetensors"]
+    assert [key[0] for key in _lora_cache] == [x, z]
+
+    load_lora_cached(x, 2)
+    load_lora_cached(y, 2)
+    assert reads[3:] == ["y.safetensors"]
+
+def test_cache_size_zero_caches_nothing(loras):
+    folder, reads, _ = loras
+    path = str(folder / "x.safetensors")
+    load_lora_cached(path, 0)
+    load_lora_cached(path, 0)
+    assert reads == ["x.safetensors", "x.safetensors"]
+    assert not _lora_cache
+
+def test_parse_lora_columns():
+    assert parse_lora_columns("E:F, G:H") == [(5, 6), (7, 8)]
+    assert parse_lora_columns(" e : f ,, K ") == [(5, 6), (11, None)]
+    assert parse_lora_columns("E:") == [(5, None)]
+    assert parse_lora_columns("") == []
+
+@pytest.mark.parametrize("spec", ["E:F:G", "1:F", "E:#", ":F", "AAAA"])
+def test_parse_lora_columns_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_lora_columns(spec)
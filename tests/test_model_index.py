@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from exloadout.exLoadoutModelIndex import get_filename_set
+
+@pytest.fixture
+def lora_folder(model_folder):
+    return model_folder("loras")
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb"):
+        pass
+
+def test_set_is_cached_while_nothing_changes(lora_folder):
+    touch(str(lora_folder / "x.safetensors"))
+    first = get_filename_set("loras")
+    assert first == {"x.safetensors"}
+    assert get_filename_set("loras") is first
+
+def test_new_model_in_an_intermediate_directory_is_seen(lora_folder):
+    touch(str(lora_folder / "a" / "b" / "x.safetensors"))
+    assert get_filename_set("loras") == {os.path.join("a", "b", "x.safetensors")}
+
+    touch(str(lora_folder / "a" / "y.safetensors"))
+    assert get_filename_set("loras") == {os.path.join("a", "b", "x.safetensors"), os.path.join("a", "y.safetensors")}
+
+def test_new_subdirectory_and_removed_model_are_seen(lora_folder):
+    touch(str(lora_folder / "x.safetensors"))
+    assert get_filename_set("loras") == {"x.safetensors"}
+
+    touch(str(lora_folder / "new" / "deep" / "z.safetensors"))
+    os.remove(str(lora_folder / "x.safetensors"))
+    assert get_filename_set("loras") == {os.path.join("new", "deep", "z.safetensors")}
@@ -0,0 +1,137 @@
+import os
+import shutil
+import struct
+
+import pytest
+
+from conftest import MODELS_DIR, create_workbook, write_safetensors
+from exloadout.exLoadoutModelInfo import get_model_info, read_safetensors_header
+from exloadout.exLoadoutModelIndex import get_filename_set
+from exloadout.exLoadoutSnapshot import compile_snapshot
+from exloadout.exLoadoutValidate import MODEL_COLUMNS, describe_models
+
+def test_header_summary(tmp_path):
+    path = str(tmp_path / "model.safetensors")
+    write_safetensors(path, {
+        "a.weight": ("F16", [4, 8]),
+        "b.weight": ("F16", [16]),
+        "c.bias": ("F32", [2, 2]),
+    }, metadata={"format": "pt"})
+
+    info = get_model_info(path)
+    assert info.tensor_count == 3
+    assert info.parameter_count == 32 + 16 + 4
+    assert info.total_bytes == (32 + 16) * 2 + 4 * 4
+    assert info.dtypes == {"F16": 48, "F32": 4}
+    assert info.main_dtype == "F16"
+    assert info.metadata == {"format": "pt"}
+
+def test_header_is_read_without_the_weights(tmp_path):
+    path = str(tmp_path / "large.safetensors")
+    write_safetensors(path, {"w": ("F32", [1024, 1024])})
+    header = read_safetensors_header(path)
+    assert header["w"]["shape"] == [1024, 1024]
+    assert os.path.getsize(path) > 4 * 1024 * 1024
+
+def test_info_is_cached_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "model.safetensors")
+    write_safetensors(path, {"w": ("F16", [4])})
+    first = get_model_info(path)
+    assert get_model_info(path) is first
+
+    write_safetensors(path, {"w": ("F16", [4]), "v": ("F16", [4])})
+    second = get_model_info(path)
+    assert second is not first
+    assert second.tensor_count == 2
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"\x01\x00",
+    struct.pack("<Q", 1 << 40) + b"{}",  # Header length far past the limit
+    struct.pack("<Q", 64) + b"{}",       # Truncated header
+    struct.pack("<Q", 3) + b"abc",       # Not JSON
+    struct.pack("<Q", 2) + b"[]",        # Not an object
+])
+def test_invalid_files_are_reported_not_raised(tmp_path, content):
+    path = tmp_path / "broken.safetensors"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        read_safetensors_header(str(path))
+    assert get_model_info(str(path)) is None
+
+def test_other_file_types_are_skipped(tmp_path):
+    path = tmp_path / "model.ckpt"
+    path.write_bytes(b"not a safetensors file")
+    assert get_model_info(str(path)) is None
+
+def info_for(tmp_path, tensors):
+    path = str(tmp_path / "model.safetensors")
+    write_safetensors(path, {name: ("F16", shape) for name, shape in tensors.items()})
+    return get_model_info(path)
+
+@pytest.mark.parametrize("tensors, family, is_checkpoint", [
+    ({"model.diffusion_model.double_blocks.0.w": [4], "model.diffusion_model.single_blocks.0.w": [4]}, "flux", True),
+    ({"model.diffusion_model.joint_blocks.0.w": [4]}, "sd3", True),
+    ({"patch_embedding.weight": [4], "blocks.0.cross_attn.q.weight": [4]}, "wan", True),
+    ({"model.diffusion_model.input_blocks.0.w": [4], "conditioner.embedders.0.w": [4]}, "sdxl", True),
+    ({"model.diffusion_model.input_blocks.0.w": [4], "cond_stage_model.model.transformer.w": [4]}, "sd2", True),
+    ({"model.diffusion_model.input_blocks.0.w": [4], "cond_stage_model.transformer.w": [4]}, "sd1", True),
+    ({"encoder.block.0.layer.0.SelfAttention.q.weight": [4], "shared.weight": [4]}, "t5", False),
+    ({"text_model.encoder.layers.0.w": [4], "text_model.embeddings.token_embedding.weight": [8, 768]}, "clip_l", False),
+    ({"text_model.encoder.layers.0.w": [4], "text_model.embeddings.token_embedding.weight": [8, 1280]}, "clip_g", False),
+    ({"decoder.up.0.w": [4], "encoder.down.0.w": [4], "quant_conv.weight": [4]}, "vae", False),
+])
+def test_family_detection(tmp_path, tensors, family, is_checkpoint):
+    info = info_for(tmp_path, tensors)
+    assert info.family == family
+    assert info.is_checkpoint is is_checkpoint
+
+def test_all_in_one_lumina2_checkpoint_is_a_checkpoint(tmp_path):
+    info = info_for(tmp_path, {
+        "model.diffusion_model.layers.0.attention.qkv.weight": [4],
+        "first_stage_model.encoder.down.0.block.0.conv1.weight": [4],
+        "first_stage_model.decoder.up.0.block.0.conv1.weight": [4],
+        "text_encoders.gemma2_2b.transformer.model.layers.0.mlp.up_proj.weight": [4],
+    })
+    assert info.is_checkpoint
+    assert info.components == ["text_encoder", "unet", "vae"]
+
+def test_all_in_one_stable_audio_checkpoint_is_a_checkpoint(tmp_path):
+    info = info_for(tmp_path, {
+        "model.model.transformer.layers.0.self_attn.to_qkv.weight": [4],
+        "conditioner.conditioners.prompt.model.encoder.block.0.layer.0.SelfAttention.q.weight": [4],
+        "conditioner.conditioners.prompt.model.shared.weight": [4],
+        "pretransform.model.decoder.layers.0.weight": [4],
+    })
+    assert info.family != "t5"
+    assert info.is_checkpoint
+
+def test_validator_flags_only_standalone_files_in_column_b(tmp_path, model_folder):
+    checkpoints = model_folder("checkpoints")
+    for name in ("base.safetensors", "other.safetensors"):
+        shutil.copy(os.path.join(MODELS_DIR, "checkpoints", name), checkpoints / name)
+    write_safetensors(str(checkpoints / "t5_in_b.safetensors"), {
+        "encoder.block.0.layer.0.SelfAttention.q.weight": ("F16", [4]),
+        "shared.weight": ("F16", [4]),
+    })
+    write_safetensors(str(checkpoints / "lumina_aio.safetensors"), {
+        "model.diffusion_model.layers.0.attention.qkv.weight": ("F16", [4]),
+        "first_stage_model.decoder.up.0.w": ("F16", [4]),
+        "first_stage_model.encoder.down.0.w": ("F16", [4]),
+    })
+    path = create_workbook(str(tmp_path / "loadouts.xlsx"), rows=[
+        ("LOADOUT", "MODEL", "CLIP", "VAE"),
+        ("Wrong", "t5_in_b.safetensors", None, None),
+        ("Lumina", "lumina_aio.safetensors", None, None),
+        ("Full", "other.safetensors", "t5.safetensors", "ae.safetensors"),
+    ])
+    filename_sets = {folder_name: get_filename_set(folder_name) for folder_name, _ in MODEL_COLUMNS.values()}
+
+    lines, issues = describe_models(compile_snapshot(path)["MODELS"], filename_sets)
+
+    assert issues == ["Row 2: loadout 'Wrong' has a t5 file 't5_in_b.safetensors' in Column B, not a checkpoint."]
+    assert len(lines) == 3
+    assert lines[2].startswith("Row 4 'Full': checkpoint flux")
+    assert "CLIP t5" in lines[2] and "VAE vae" in lines[2]
+    # Written to a per-test folder; the shared checkpoints folder keeps only the conftest models
+    assert sorted(os.listdir(os.path.join(MODELS_DIR, "checkpoints"))) == ["base.safetensors", "other.safetensors"]
@@ -0,0 +1,126 @@
+import asyncio
+import os
+
+import openpyxl
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from exloadout.exLoadoutRoutes import register_routes
+
+def call(method, path, **kwargs):
+    """Sends one request to a fresh app with the exLoadout routes; returns (status, JSON body)."""
+    async def run():
+        routes = web.RouteTableDef()
+        register_routes(routes)
+        app = web.Application()
+        app.add_routes(routes)
+        async with TestClient(TestServer(app)) as client:
+            response = await client.request(method, path, **kwargs)
+            return response.status, await response.json()
+    return asyncio.run(run())
+
+def cell(full_path, coordinate):
+    workbook = openpyxl.load_workbook(full_path)
+    try:
+        return workbook["MODELS"][coordinate].value
+    finally:
+        workbook.close()
+
+def test_list_sheets(package_workbook):
+    excel_path, _ = package_workbook
+    assert call("GET", "/exloadout/sheets", params={"excel_path": excel_path}) == (200, {"sheets": ["MODELS"]})
+
+def test_list_options(package_workbook):
+    excel_path, _ = package_workbook
+    status, body = call("GET", "/exloadout/options", params={"excel_path": excel_path, "sheet_name": "MODELS"})
+    assert status == 200
+    assert body["non_empty"] == ["Base", "BaseVae", "Full", "BadVae"]
+    assert body["default"] == "Base"
+
+def test_get_row_by_number_and_key(package_workbook):
+    excel_path, _ = package_workbook
+    params = {"excel_path": excel_path, "sheet_name": "MODELS"}
+    by_number = call("GET", "/exloadout/row", params={**params, "row_number": "4"})
+    by_key = call("GET", "/exloadout/row", params={**params, "search_string": "Full"})
+    assert by_number == by_key
+    status, body = by_key
+    assert status == 200
+    assert body["row"] == 4
+    assert body["columns"]["B"] == "other.safetensors"
+    assert body["columns"]["L"] is None
+
+def test_missing_resources_are_404(package_workbook):
+    excel_path, _ = package_workbook
+    status, _ = call("GET", "/exloadout/row", params={"excel_path": excel_path, "sheet_name": "MODELS", "search_string": "Nope"})
+    assert status == 404
+    status, _ = call("GET", "/exloadout/sheets", params={"excel_path": "missing.xlsx"})
+    assert status == 404
+
+def test_invalid_requests_are_400(package_workbook):
+    excel_path, _ = package_workbook
+    assert call("GET", "/exloadout/sheets", params={"excel_path": "../outside.xlsx"})[0] == 400
+    assert call("GET", "/exloadout/sheets", params={"excel_path": "notes.txt"})[0] == 400
+    assert call("GET", "/exloadout/options", params={"excel_path": excel_path, "sheet_name": "NOPE"})[0] == 400
+    assert call("GET", "/exloadout/row", params={"excel_path": excel_path, "sheet_name": "MODELS", "row_number": "99"})[0] == 400
+
+def test_batched_edits_are_saved(package_workbook):
+    excel_path, full_path = package_workbook
+    status, body = call("POST", "/exloadout/edits", json={
+        "excel_path": excel_path, "sheet_name": "MODELS",
+        "edits": [
+            {"row_number": 2, "column_letter": "C", "value": "t5.safetensors"},
+            {"key": "Full", "column_letter": "E", "value": 7},
+        ],
+    })
+    assert status == 200
+    assert body["rows"]["2"].startswith("A2: Base, B2: base.safetensors, C2: t5.safetensors")
+    assert cell(full_path, "C2") == "t5.safetensors"
+    assert cell(full_path, "E4") == 7
+
+def test_journaled_edits_are_visible_before_compaction(package_workbook):
+    excel_path, full_path = package_workbook
+    status, _ = call("POST", "/exloadout/edits", json={
+        "excel_path": excel_path, "sheet_name": "MODELS", "journal": True,
+        "edits": [{"key": "Base", "column_letter": "D", "value": "ae.safetensors"}],
+    })
+    assert status == 200
+    assert cell(full_path, "D2") is None
+    _, body = call("GET", "/exloadout/row", params={"excel_path": excel_path, "sheet_name": "MODELS", "search_string": "Base"})
+    assert body["columns"]["D"] == "ae.safetensors"
+
+def test_bad_values_are_rejected_before_writing(package_workbook):
+    excel_path, full_path = package_workbook
+    mtime = os.stat(full_path).st_mtime_ns
+    for journal in (False, True):
+        for value in ({"a": 1}, [1, 2], "bad\x01"):
+            status, body = call("POST", "/exloadout/edits", json={
+                "excel_path": excel_path, "sheet_name": "MODELS", "journal": journal,
+                "edits": [{"row_number": 3, "column_letter": "B", "value": value}],
+            })
+            assert status == 400, (journal, value)
+            assert "error" in body
+    assert os.stat(full_path).st_mtime_ns == mtime
+    assert not os.path.exists(full_path + ".journal")
+
+    # The workbook still accepts good edits afterwards
+    status, _ = call("POST", "/exloadout/edits", json={
+        "excel_path": excel_path, "sheet_name": "MODELS",
+        "edits": [{"row_number": 3, "column_letter": "B", "value": "other.safetensors"}],
+    })
+    assert status == 200
+    assert cell(full_path, "B3") == "other.safetensors"
+
+def test_malformed_edit_batches_are_400(package_workbook):
+    excel_path, _ = package_workbook
+    base = {"excel_path": excel_path, "sheet_name": "MODELS"}
+    assert call("POST", "/exloadout/edits", json={**base, "edits": []})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": [{"column_letter": "B"}]})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": [{"row_number": 2, "column_letter": "M", "value": "x"}]})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": [{"key": "Nope", "column_letter": "B", "value": "x"}]})[0] == 400
+    assert call("POST", "/exloadout/edits", json=[1, 2])[0] == 400
+    assert call("POST", "/exloadout/edits", json="edits")[0] == 400
+    assert call("POST", "/exloadout/edits", data=b"{not json", headers={"Content-Type": "application/json"})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": {"key": "Base"}})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": "B2"})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": [1, 2]})[0] == 400
+    assert call("POST", "/exloadout/edits", json={**base, "edits": [["Base", "B", "x"]]})[0] == 400
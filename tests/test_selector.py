@@ -0,0 +1,100 @@
+import importlib
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from conftest import create_workbook
+from exloadout.exLoadoutSelector import AliasTable, exLoadoutSelector
+
+# The package re-exports the node class under the module's name, so fetch the module itself
+selector_module = importlib.import_module("exloadout.exLoadoutSelector")
+
+WEIGHTED_ROWS = [
+    ("LOADOUT", "MODEL", "CLIP", "VAE", "WEIGHT"),
+    ("Rare", "base.safetensors", None, None, 1),
+    ("Common", "base.safetensors", None, None, 3),
+    ("Never", "base.safetensors", None, None, 0),
+    ("Default", "base.safetensors", None, None, None),
+    ("Broken", "base.safetensors", None, None, "heavy"),
+    ("Usual", "base.safetensors", None, None, 5),
+]
+POSITIVE = {"Rare", "Common", "Default", "Usual"}
+
+@pytest.fixture(autouse=True)
+def fresh_selector_state():
+    caches = (exLoadoutSelector._samplers, exLoadoutSelector._seeded_rngs,
+              exLoadoutSelector._permutations, exLoadoutSelector._column_a_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+@pytest.fixture
+def weighted_workbook(package_workbook):
+    excel_path, full_path = package_workbook
+    create_workbook(full_path, rows=WEIGHTED_ROWS)
+    return excel_path, full_path
+
+def draw(excel_path, mode, seed=0, count=1):
+    node = exLoadoutSelector()
+    return [node.get_selected_loadout(excel_path, "MODELS", "empty", mode, "E", seed)[1] for _ in range(count)]
+
+def test_alias_table_follows_the_weights():
+    weights = [1, 3, 0, 6]
+    table = AliasTable(weights)
+    rng = random.Random(1234)
+    draws = 40000
+    counts = Counter(table.draw(rng) for _ in range(draws))
+    assert counts[2] == 0
+    for index, weight in enumerate(weights):
+        assert abs(counts[index] / draws - weight / sum(weights)) < 0.02, index
+
+def test_weighted_modes_never_pick_zero_weights(weighted_workbook):
+    excel_path, _ = weighted_workbook
+    for mode in ("Weighted", "Weighted (Seeded)", "Shuffle (No Replacement)"):
+        picked = set(draw(excel_path, mode, count=200))
+        assert picked == POSITIVE, mode
+
+def test_same_seed_gives_the_same_sequence(weighted_workbook):
+    excel_path, _ = weighted_workbook
+    for mode in ("Weighted (Seeded)", "Shuffle (No Replacement)"):
+        first = draw(excel_path, mode, seed=5, count=20)
+        other = draw(excel_path, mode, seed=6, count=20)
+        # Changing the seed back restarts the sequence from its beginning
+        again = draw(excel_path, mode, seed=5, count=20)
+        assert first == again, mode
+        assert first != other, mode
+
+def test_shuffle_covers_every_loadout_once_per_pass(weighted_workbook):
+    excel_path, _ = weighted_workbook
+    sequence = draw(excel_path, "Shuffle (No Replacement)", seed=3, count=4 * len(POSITIVE))
+    passes = [sequence[i:i + len(POSITIVE)] for i in range(0, len(sequence), len(POSITIVE))]
+    for loadouts in passes:
+        assert sorted(loadouts) == sorted(POSITIVE)
+    # Each pass is reshuffled with a new order
+    assert len({tuple(loadouts) for loadouts in passes}) > 1
+
+def test_alias_table_is_rebuilt_only_when_the_sheet_changes(weighted_workbook, monkeypatch):
+    excel_path, full_path = weighted_workbook
+    builds = []
+
+    class CountingAliasTable(AliasTable):
+        __slots__ = ()
+
+        def __init__(self, weights):
+            builds.append(list(weights))
+            super().__init__(weights)
+
+    monkeypatch.setattr(selector_module, "AliasTable", CountingAliasTable)
+    draw(excel_path, "Weighted", count=10)
+    draw(excel_path, "Weighted (Seeded)", seed=1, count=10)
+    assert builds == [[1.0, 3.0, 0.0, 1.0, 0.0, 5.0]]
+
+    create_workbook(full_path, rows=WEIGHTED_ROWS[:3])
+    stat = os.stat(full_path)
+    os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert set(draw(excel_path, "Weighted", count=10)) <= {"Rare", "Common"}
+    assert builds[1:] == [[1.0, 3.0]]
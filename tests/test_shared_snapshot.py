@@ -0,0 +1,102 @@
+import datetime
+import os
+
+import pytest
+
+from conftest import create_workbook
+from exloadout.exLoadoutSharedSnapshot import SharedWorkbookSnapshot, load_shared_snapshot, write_shared_snapshot
+from exloadout.exLoadoutSnapshot import InternTable, WorkbookSnapshot, build_sheet, compile_snapshot
+
+def share(tmp_path, snapshot):
+    out_path = str(tmp_path / "test.exlsnap")
+    write_shared_snapshot(snapshot, out_path, 1)
+    return SharedWorkbookSnapshot(snapshot.path, out_path)
+
+def snapshot_of(sheets):
+    """Builds a WorkbookSnapshot straight from {title: rows}, without going through openpyxl."""
+    table = InternTable()
+    built = {title: build_sheet(title, rows, table) for title, rows in sheets.items()}
+    table.freeze()
+    return WorkbookSnapshot("memory.xlsx", False, 0, 0, built, table)
+
+VALUES = [
+    "text", "ünïcode ✓", "", 0, -7, 2 ** 40, 1.5, 1.0, float("inf"), True, False, None,
+    datetime.datetime(2024, 5, 6, 7, 8, 9, 123456), datetime.date(2024, 5, 6),
+    datetime.time(7, 8, 9), datetime.timedelta(days=1, seconds=30, microseconds=5),
+]
+
+def test_every_value_tag_round_trips(tmp_path):
+    snapshot = snapshot_of({"MODELS": [VALUES]})
+    decoded = share(tmp_path, snapshot)["MODELS"].row(1).values()
+    assert decoded == VALUES
+    assert [type(value) for value in decoded] == [type(value) for value in VALUES]
+
+def test_equal_values_of_different_types_keep_their_type(tmp_path):
+    shared = share(tmp_path, snapshot_of({"MODELS": [(1, 1.0, True, "1")]}))["MODELS"]
+    assert [type(value) for value in shared.row(1).values()] == [int, float, bool, str]
+
+KEY_ROWS = [
+    ("LOADOUT", "MODEL"),
+    ("  Spaced  ", "first"),
+    ("Dup", "first"),
+    (None, "no key"),
+    ("Dup", "second"),
+    (5, "number"),
+    ("Spaced", "second"),
+    ("b", "lower"),
+    ("B", "upper"),
+]
+
+@pytest.mark.parametrize("key", ["LOADOUT", "Spaced", "  Spaced  ", "Dup", "5", "b", "B", "Missing", ""])
+def test_find_row_matches_the_local_snapshot(tmp_path, key):
+    local = snapshot_of({"MODELS": KEY_ROWS})
+    shared = share(tmp_path, local)
+    assert shared["MODELS"].find_row(key) == local["MODELS"].find_row(key)
+
+def test_find_row_returns_the_first_stripped_match(tmp_path):
+    shared = share(tmp_path, snapshot_of({"MODELS": KEY_ROWS}))["MODELS"]
+    assert shared.find_row("Spaced") == 2
+    assert shared.find_row("Dup") == 3
+    assert shared.find_row("5") == 6
+
+def test_empty_sheets(tmp_path):
+    local = snapshot_of({"Empty": [], "MODELS": KEY_ROWS})
+    shared = share(tmp_path, local)
+    assert shared.sheetnames == ["Empty", "MODELS"]
+    empty = shared["Empty"]
+    assert (empty.max_row, empty.max_column) == (0, 0)
+    assert empty.find_row("Dup") is None
+    assert empty.find_row("Dup") == local["Empty"].find_row("Dup")
+    assert empty.value(1, 1) is None
+    assert empty.column_values(1) == []
+
+def test_new_generation_replaces_the_old_file(tmp_path):
+    path = create_workbook(str(tmp_path / "loadouts.xlsx"))
+    first = load_shared_snapshot(path)
+    assert first.generation == 1
+    assert load_shared_snapshot(path) is first
+    assert os.path.exists(f"{path}.1.exlsnap")
+
+    create_workbook(path, rows=[("LOADOUT", "MODEL"), ("Changed", "other.safetensors"), ("Added", "base.safetensors")])
+    second = load_shared_snapshot(path)
+    assert second.generation == 2
+    assert second["MODELS"].find_row("Added") == 3
+    assert os.path.exists(f"{path}.2.exlsnap")
+    assert not os.path.exists(f"{path}.1.exlsnap")
+    # The old mapping stays readable for whoever still holds it
+    assert first["MODELS"].find_row("Full") == 4
+
+def test_data_only_snapshots_use_their_own_files(tmp_path):
+    path = create_workbook(str(tmp_path / "loadouts.xlsx"), rows=[("LOADOUT", "STEPS"), ("Base", "=10+10")])
+    formulas = load_shared_snapshot(path)
+    values = load_shared_snapshot(path, data_only=True)
+
+    assert formulas.snapshot_path == f"{path}.1.exlsnap"
+    assert values.snapshot_path == f"{path}.values.1.exlsnap"
+    assert os.path.exists(f"{path}.exlsnap.gen")
+    assert os.path.exists(f"{path}.values.exlsnap.gen")
+    assert not formulas.data_only and values.data_only
+    assert formulas["MODELS"].value(2, 2) == compile_snapshot(path)["MODELS"].value(2, 2) == "=10+10"
+    # openpyxl stores no cached result, so the data_only view has none either
+    assert values["MODELS"].value(2, 2) == compile_snapshot(path, data_only=True)["MODELS"].value(2, 2)
+    assert values["MODELS"].value(2, 2) != "=10+10"
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from conftest import LOADOUT_ROWS, create_workbook
+from exloadout.exLoadoutSnapshot import InternTable, build_sheet, compile_snapshot, invalidate_snapshot, load_snapshot
+
+def sheet_of(rows):
+    return build_sheet("MODELS", rows, InternTable())
+
+def test_narrow_rows_are_padded_when_a_later_row_is_wider():
+    sheet = sheet_of([("a",), ("b", None, "c"), ()])
+    assert (sheet.max_row, sheet.max_column) == (3, 3)
+    assert [len(codes) for codes in sheet._columns] == [3, 3, 3]
+    assert sheet.row(1).values() == ["a", None, None]
+    assert sheet.row(2).values() == ["b", None, "c"]
+    assert sheet.row(3).values() == [None, None, None]
+
+def test_code_width_narrows_for_small_value_tables():
+    assert {codes.typecode for codes in sheet_of([("a", 1), ("b", 2)])._columns} == {"H"}
+
+    table = InternTable()
+    for value in range(0x10000):
+        table.code_for(value)
+    wide = build_sheet("MODELS", [("a", 1), ("b", 0xFFFF)], table)
+    assert {codes.typecode for codes in wide._columns} == {"I"}
+    assert wide.value(2, 2) == 0xFFFF
+
+def test_equal_values_of_different_types_stay_distinct():
+    values = sheet_of([(1, 1.0, True)]).row(1).values()
+    assert [type(value) for value in values] == [int, float, bool]
+
+def test_find_row_baseline_behaviour():
+    sheet = sheet_of([("LOADOUT", "MODEL"), ("  Base ", "a"), (None, "b"), ("Base", "c"), (7, "d")])
+    assert sheet.find_row("LOADOUT") == 1  # The header row is searched like any other
+    assert sheet.find_row("Base") == 2     # Stripped, and the first match wins
+    assert sheet.find_row("  Base ") is None
+    assert sheet.find_row("7") == 5
+    assert sheet.find_row("Missing") is None
+
+@pytest.mark.parametrize("row, column", [(0, 1), (1, 0), (6, 1), (1, 3), (-1, -1)])
+def test_values_out_of_range_are_empty(row, column):
+    sheet = sheet_of([("a", "b")] * 5)
+    assert sheet.value(row, column) is None
+
+def test_column_values_of_out_of_range_columns():
+    sheet = sheet_of([("a", "b"), ("c",), ("d", "e")])
+    assert sheet.column_values(2) == ["b", None, "e"]
+    assert sheet.column_values(2, min_row=2) == [None, "e"]
+    assert sheet.column_values(0) == [None, None, None]
+    assert sheet.column_values(9) == [None, None, None]
+    assert sheet.column_values(9, min_row=3) == [None]
+    assert sheet.column_values(9, min_row=5) == []
+
+def test_compiled_workbook_matches_the_rows(workbook_path):
+    sheet = compile_snapshot(workbook_path)["MODELS"]
+    assert [sheet.row(row).values() for row in range(1, sheet.max_row + 1)] == [list(row) for row in LOADOUT_ROWS]
+
+def test_snapshot_is_cached_until_the_file_changes(workbook_path):
+    first = load_snapshot(workbook_path, with_journal=False)
+    assert load_snapshot(workbook_path, with_journal=False) is first
+
+    # Same size, newer mtime
+    stat = os.stat(workbook_path)
+    os.utime(workbook_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = load_snapshot(workbook_path, with_journal=False)
+    assert second is not first
+
+    # New content, so a different size
+    create_workbook(workbook_path, rows=LOADOUT_ROWS + [("Added", "base.safetensors")])
+    third = load_snapshot(workbook_path, with_journal=False)
+    assert third is not second
+    assert third["MODELS"].find_row("Added") == len(LOADOUT_ROWS) + 1
+
+def test_invalidate_snapshot_forces_a_rebuild(workbook_path):
+    first = load_snapshot(workbook_path, with_journal=False)
+    values = load_snapshot(workbook_path, data_only=True, with_journal=False)
+    invalidate_snapshot(workbook_path)
+    assert load_snapshot(workbook_path, with_journal=False) is not first
+    assert load_snapshot(workbook_path, data_only=True, with_journal=False) is not values